@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the socket wire formats in utils.py: newline-delimited
+JSON vs length-prefixed frames with each available codec (json, orjson,
+msgpack). Reports encode/decode cost and size for typical Task 1-3 / Task 7
+messages, then round-trip throughput over a local socket pair.
+"""
+
+import socket
+import threading
+import time
+
+import utils
+
+MESSAGES = {
+    "violation": {"roll": 65, "name": "Khushal", "warning": "Please focus, exam in progress!",
+                  "counter": 3, "question_no": 17, "violation_no": 1},
+    "marks_report": {"command": "marks_report", "marks": {"58": 0, "59": 50, "65": 0, "75": 100, "68": 100}},
+    "submit": {"type": "SUBMIT", "student_id": "S023", "payload": {"answers_hash": "hash_of_S023"}},
+}
+ITERATIONS = 50000
+ROUND_TRIPS = 20000
+
+
+def per_call_us(fn, arg, iterations=ITERATIONS):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench_codecs():
+    print(f"{'message':<13} {'format':<16} {'bytes':>6} {'encode us':>10} {'decode us':>10}")
+    print("-" * 59)
+    for label, msg in MESSAGES.items():
+        line = utils._json_encode(msg) + b"\n"
+        encode_line = lambda m: utils._json_encode(m) + b"\n"
+        print(f"{label:<13} {'newline json':<16} {len(line):>6} "
+              f"{per_call_us(encode_line, msg):>10.2f} "
+              f"{per_call_us(utils.json.loads, line):>10.2f}")
+        for name, (_, encode, decode) in utils.CODECS.items():
+            payload = encode(msg)
+            size = utils.FRAME_HEADER.size + len(payload)
+            print(f"{label:<13} {'frame ' + name:<16} {size:>6} "
+                  f"{per_call_us(encode, msg):>10.2f} {per_call_us(decode, payload):>10.2f}")
+    print()
+
+
+def echo(sock):
+    for msg in utils.json_reader(sock):
+        utils.send_json(sock, msg)
+
+
+def bench_round_trips(codec):
+    """Sequential request/reply over a socketpair; codec None = newline JSON"""
+    client, server = socket.socketpair()
+    # Both ends share one process, so set the codec directly instead of negotiating
+    utils.json_reader(client).codec = codec
+    utils.json_reader(server).codec = codec
+    threading.Thread(target=echo, args=(server,), daemon=True).start()
+    msg = MESSAGES["violation"]
+    start = time.perf_counter()
+    for _ in range(ROUND_TRIPS):
+        utils.send_json(client, msg)
+        utils.recv_json(client)
+    elapsed = time.perf_counter() - start
+    client.close()
+    return ROUND_TRIPS / elapsed
+
+
+def main():
+    print(f"Codecs available: {', '.join(utils.CODECS)}\n")
+    bench_codecs()
+    print(f"{'format':<16} {'round trips/s':>14}")
+    print("-" * 31)
+    print(f"{'newline json':<16} {bench_round_trips(None):>14,.0f}")
+    for name in utils.CODECS:
+        print(f"{'frame ' + name:<16} {bench_round_trips(name):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
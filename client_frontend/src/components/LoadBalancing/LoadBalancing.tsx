@@ -11,6 +11,7 @@ import {
   XCircle
 } from 'lucide-react';
 import { loadBalanceApi } from '../../services/api';
+import { subscribeEvents } from '../../services/events';
 import type { LoadBalanceSubmission, LoadBalanceResponse, LoadBalanceStatus } from '../../types';
 
 interface Submission {
@@ -36,8 +37,16 @@ const LoadBalancing: React.FC = () => {
 
   useEffect(() => {
     fetchLoadBalanceStatus();
-    const interval = setInterval(fetchLoadBalanceStatus, 3000); // Refresh every 3 seconds
-    return () => clearInterval(interval);
+    // Batch progress is pushed by the server as each submission is routed and processed
+    return subscribeEvents(['load_balance'], (event) => {
+      if (event.type === 'load_balance') {
+        setLoadBalanceStatus(event.status);
+      } else if (event.type === 'snapshot' && event.load_balance) {
+        setLoadBalanceStatus(event.load_balance);
+      } else if (event.type === 'hello' && event.resync) {
+        fetchLoadBalanceStatus();
+      }
+    });
   }, []);
 
   const fetchLoadBalanceStatus = async () => {
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { 
   Lock, 
   Users, 
@@ -10,7 +10,21 @@ import {
   Square
 } from 'lucide-react';
 import { mutexApi } from '../../services/api';
-import type { MutexRequest, MutexResponse, MutexStatus } from '../../types';
+import { subscribeEvents } from '../../services/events';
+import type { MutexChange, MutexRequest, MutexResponse, MutexStatus } from '../../types';
+
+// Apply a pushed change to the last fetched status; null if it doesn't line
+// up (nothing fetched yet, or an event was missed) and a refetch is needed
+const applyMutexChange = (status: MutexStatus | null, change: MutexChange): MutexStatus | null => {
+  if (!status) return null;
+  const { enqueued, removed, ...summary } = change;
+  const queue = status.queue.filter(item => item.student !== removed);
+  if (enqueued) {
+    queue.splice(enqueued.queue_position - 1, 0, { student: enqueued.student, timestamp: enqueued.timestamp });
+  }
+  if (queue.length !== change.queue_length) return null;
+  return { ...status, ...summary, queue };
+};
 
 interface Student {
   id: string;
@@ -26,6 +40,8 @@ const MutualExclusion: React.FC = () => {
     { id: 's3', name: 'Student 3', timestamp: 1002, status: 'waiting' }
   ]);
   const [mutexStatus, setMutexStatus] = useState<MutexStatus | null>(null);
+  const mutexStatusRef = useRef<MutexStatus | null>(null);
+  mutexStatusRef.current = mutexStatus;
   const [responses, setResponses] = useState<MutexResponse[]>([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -39,10 +55,48 @@ const MutualExclusion: React.FC = () => {
 
   useEffect(() => {
     fetchMutexStatus();
-    const interval = setInterval(fetchMutexStatus, 2000); // Refresh every 2 seconds
-    return () => clearInterval(interval);
+    // Grants, transfers and queue changes are pushed by the server; a resume
+    // snapshot carries the full status
+    return subscribeEvents(['mutex'], (event) => {
+      if (event.type === 'snapshot' && event.mutex) {
+        mutexStatusRef.current = event.mutex;
+        setMutexStatus({ ...event.mutex });
+        return;
+      }
+      if (event.type === 'hello' && event.resync) {
+        fetchMutexStatus();
+        return;
+      }
+      if (event.type !== 'mutex') return;
+      const next = applyMutexChange(mutexStatusRef.current, event.change);
+      if (next) {
+        mutexStatusRef.current = next;
+        setMutexStatus(next);
+      } else {
+        fetchMutexStatus();
+      }
+      if (event.event === 'granted' || event.event === 'transferred') {
+        setStudents(prev => prev.map(s =>
+          s.id === event.student_id ? { ...s, status: 'active' as const } : s
+        ));
+      }
+    });
   }, []);
 
+  // Heartbeat the lease while one of our students holds the CS; if this tab
+  // goes away the lease expires and the server passes the CS on
+  const holder = mutexStatus?.current_holder;
+  const fencingToken = mutexStatus?.fencing_token;
+  const leaseSeconds = mutexStatus?.lease_seconds;
+  useEffect(() => {
+    if (!holder || fencingToken == null || !leaseSeconds) return;
+    if (!students.some(s => s.id === holder)) return;
+    const timer = setInterval(() => {
+      mutexApi.renewLease(holder, fencingToken).catch(() => fetchMutexStatus());
+    }, (leaseSeconds * 1000) / 3);
+    return () => clearInterval(timer);
+  }, [holder, fencingToken, leaseSeconds]);
+
   const fetchMutexStatus = async () => {
     console.log('Refresh button clicked - Mutual Exclusion');
     try {
@@ -82,8 +136,7 @@ const MutualExclusion: React.FC = () => {
             ? { ...s, status: 'waiting' as const }
             : s
         ));
-        // Start polling for grant
-        pollForGrant(student.id);
+        // The grant arrives as a pushed 'mutex' event
       }
     } catch (err) {
       setError('Failed to request critical section');
@@ -93,40 +146,13 @@ const MutualExclusion: React.FC = () => {
     }
   };
 
-  const pollForGrant = async (studentId: string) => {
-    const maxAttempts = 30; // Poll for up to 60 seconds
-    let attempts = 0;
-    
-    const poll = async () => {
-      try {
-        const data = await mutexApi.checkGrant(studentId);
-
-        if (data.status === 'granted') {
-          setStudents(prev => prev.map(s => 
-            s.id === studentId ? { ...s, status: 'active' as const } : s
-          ));
-          setResponses(prev => [...prev, data]);
-          return;
-        }
-        
-        attempts++;
-        if (attempts < maxAttempts) {
-          setTimeout(poll, 2000); // Poll every 2 seconds
-        }
-      } catch (err) {
-        console.error('Polling error:', err);
-      }
-    };
-    
-    poll();
-  };
-
   const releaseCriticalSection = async (studentId: string) => {
     setLoading(true);
     setError(null);
 
     try {
-      const response = await mutexApi.releaseCriticalSection(studentId);
+      const token = mutexStatus?.current_holder === studentId ? mutexStatus.fencing_token : undefined;
+      const response = await mutexApi.releaseCriticalSection(studentId, token);
       setResponses(prev => [...prev, response]);
 
       // Update student status back to waiting so they can request again
@@ -10,6 +10,8 @@ import {
   Play
 } from 'lucide-react';
 import { examApi } from '../../services/api';
+import { subscribeEvents } from '../../services/events';
+import { startTelemetry } from '../../services/telemetry';
 import { useUser } from '../../contexts/UserContext';
 
 interface Question {
@@ -41,6 +43,20 @@ const StudentPortal = () => {
 
   useEffect(() => {
     fetchExamStatus();
+    // Submission, auto-submit at the deadline and mark release are pushed by the server
+    return subscribeEvents([`exam:${studentId}`], (event) => {
+      if (event.type === 'hello' && event.resync) {
+        fetchExamStatus();
+        return;
+      }
+      // A resume snapshot carries the same view as an exam_status event
+      const status = event.type === 'snapshot' ? event.exams?.[studentId] : event.type === 'exam_status' ? event : null;
+      if (!status) return;
+      setExamStatus({ student_id: status.student_id, status: status.status, marks: status.marks });
+      if (status.status === 'submitted' || status.status === 'released') {
+        setSubmitted(true);
+      }
+    });
   }, []);
 
   useEffect(() => {
@@ -50,6 +66,15 @@ const StudentPortal = () => {
     }
   }, [examStatus]);
 
+  useEffect(() => {
+    // Stream focus/tab/fullscreen/paste signals while the exam is open; the
+    // proctoring roll is the numeric tail of the roll number (23102A0058 -> 58)
+    const roll = parseInt(studentId.match(/(\d+)$/)?.[1] ?? '', 10);
+    if (examStarted && !submitted && !Number.isNaN(roll)) {
+      return startTelemetry(roll);
+    }
+  }, [examStarted, submitted]);
+
   useEffect(() => {
     if (examStarted && !submitted) {
       const timer = setInterval(() => {
@@ -82,12 +107,13 @@ const StudentPortal = () => {
     setLoading(true);
     setError(null);
     try {
-      await examApi.startExam(studentId);
+      const startData = await examApi.startExam(studentId);
       const questionsData = await examApi.getQuestions();
       setQuestions(questionsData.questions);
       setAnswers(new Array(questionsData.questions.length).fill(''));
       setExamStarted(true);
-      setTimeRemaining(1800); // Reset timer
+      // The server owns the deadline (and auto-submits at expiry); count down from it
+      setTimeRemaining(startData.remaining_seconds ?? 1800);
     } catch (err) {
       setError('Failed to start exam');
       console.error('Start exam error:', err);
@@ -243,6 +269,8 @@ const StudentPortal = () => {
                           const newAnswers = [...answers];
                           newAnswers[idx] = e.target.value;
                           setAnswers(newAnswers);
+                          examApi.saveProgress({ student_id: studentId, answers: newAnswers })
+                            .catch((err) => console.error('Failed to save progress:', err));
                         }}
                         className="h-5 w-5 text-blue-600"
                       />
@@ -95,8 +95,17 @@ export const mutexApi = {
     return response.data;
   },
 
-  releaseCriticalSection: async (studentId: string): Promise<MutexResponse> => {
-    const response = await api.post('/mutex/release', { student_id: studentId });
+  releaseCriticalSection: async (studentId: string, fencingToken?: number | null): Promise<MutexResponse> => {
+    const response = await api.post('/mutex/release', {
+      student_id: studentId,
+      fencing_token: fencingToken ?? undefined,
+    });
+    return response.data;
+  },
+
+  // Lease heartbeat from the holder; fails with 409 once the lease has expired
+  renewLease: async (studentId: string, fencingToken: number): Promise<MutexResponse> => {
+    const response = await api.post('/mutex/renew', { student_id: studentId, fencing_token: fencingToken });
     return response.data;
   },
 
@@ -108,6 +117,15 @@ export const mutexApi = {
     const response = await api.get(`/mutex/check/${studentId}`);
     return response.data;
   },
+
+  // Long-poll: resolves as soon as the student is granted the CS, or after timeoutSeconds
+  waitForGrant: async (studentId: string, timeoutSeconds = 25): Promise<MutexResponse> => {
+    const response = await api.get(`/mutex/wait/${studentId}`, {
+      params: { timeout: timeoutSeconds },
+      timeout: (timeoutSeconds + 5) * 1000,
+    });
+    return response.data;
+  },
 };
 
 // Task 6: Exam Processing API
@@ -127,6 +145,11 @@ export const examApi = {
     return response.data;
   },
 
+  saveProgress: async (submission: ExamSubmission): Promise<ExamResponse> => {
+    const response = await api.put('/exam/progress', submission);
+    return response.data;
+  },
+
   releaseMarks: async (studentId: string): Promise<ExamResponse> => {
     const response = await api.post(`/exam/release-marks/${studentId}`);
     return response.data;
@@ -0,0 +1,103 @@
+// Server-push events from /ws/session, with an SSE fallback (/api/v1/events).
+// Replaces polling: subscribe to the topics a view needs and react to events.
+
+export interface SessionEvent {
+  type: string;
+  seq?: number;
+  [key: string]: any;
+}
+
+const RECONNECT_DELAY_MS = 1000;
+const MAX_RECONNECT_DELAY_MS = 15000;
+const WS_FAILURES_BEFORE_SSE = 3;
+
+export const subscribeEvents = (
+  topics: string[],
+  onEvent: (event: SessionEvent) => void
+): (() => void) => {
+  let lastSeq: number | null = null;
+  let socket: WebSocket | null = null;
+  let source: EventSource | null = null;
+  let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  let failures = 0; // consecutive failed connects, drives the backoff
+  let wsFailures = 0; // consecutive WebSocket failures, decides the SSE fallback
+  let stopped = false;
+
+  const query = () => {
+    const params = new URLSearchParams({ topics: topics.join(',') });
+    if (lastSeq !== null) params.set('last_seq', String(lastSeq));
+    return params.toString();
+  };
+
+  const handleEvent = (event: SessionEvent) => {
+    if (event.type === 'hello') {
+      const seq = event.seq ?? 0;
+      if (lastSeq !== null && seq < lastSeq) {
+        // The server restarted and lost its event history: nothing can be
+        // replayed, so views refetch their state (`resync`)
+        event = { ...event, resync: true };
+        lastSeq = seq;
+      }
+      if (lastSeq === null) lastSeq = seq;
+    } else if (event.seq !== undefined) {
+      lastSeq = event.seq;
+    }
+    onEvent(event);
+  };
+
+  // WebSocket frames are batched (?batch=1): each frame is an array of events
+  const handle = (data: string) => {
+    const parsed = JSON.parse(data);
+    (Array.isArray(parsed) ? parsed : [parsed]).forEach(handleEvent);
+  };
+
+  const scheduleReconnect = () => {
+    if (stopped) return;
+    const delay = Math.min(RECONNECT_DELAY_MS * 2 ** failures, MAX_RECONNECT_DELAY_MS);
+    failures += 1;
+    reconnectTimer = setTimeout(connect, delay);
+  };
+
+  const connectSSE = () => {
+    source = new EventSource(`/api/v1/events?${query()}`);
+    source.onopen = () => {
+      failures = 0; // wsFailures is untouched, so we stay on SSE
+    };
+    source.onmessage = (msg) => handle(msg.data);
+    source.onerror = () => {
+      // Reconnect ourselves so the resume point (last_seq) is sent
+      source?.close();
+      source = null;
+      scheduleReconnect();
+    };
+  };
+
+  const connect = () => {
+    if (stopped) return;
+    if (wsFailures >= WS_FAILURES_BEFORE_SSE || typeof WebSocket === 'undefined') {
+      connectSSE();
+      return;
+    }
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    socket = new WebSocket(`${protocol}://${window.location.host}/ws/session?${query()}&batch=1`);
+    socket.onopen = () => {
+      failures = 0;
+      wsFailures = 0;
+    };
+    socket.onmessage = (msg) => handle(msg.data);
+    socket.onclose = () => {
+      socket = null;
+      wsFailures += 1;
+      scheduleReconnect();
+    };
+  };
+
+  connect();
+
+  return () => {
+    stopped = true;
+    if (reconnectTimer) clearTimeout(reconnectTimer);
+    socket?.close();
+    source?.close();
+  };
+};
@@ -0,0 +1,69 @@
+// Streams raw proctoring signals (focus loss, tab switches, fullscreen exits,
+// pastes) to /ws/telemetry. The server counts them in sliding windows and
+// decides violations, so the browser only reports what it observes.
+
+export type TelemetryKind = 'focus_loss' | 'tab_switch' | 'fullscreen_exit' | 'paste';
+
+const FLUSH_INTERVAL_MS = 250;
+const RECONNECT_DELAY_MS = 2000;
+const MAX_PENDING_SIGNALS = 1000;
+
+export const startTelemetry = (
+  roll: number,
+  getQuestionNo: () => number = () => 0
+): (() => void) => {
+  let socket: WebSocket | null = null;
+  let pending: [number, TelemetryKind, number][] = [];
+  let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  let stopped = false;
+
+  const record = (kind: TelemetryKind) => {
+    if (pending.length < MAX_PENDING_SIGNALS) {
+      pending.push([roll, kind, getQuestionNo()]);
+    }
+  };
+
+  const flush = () => {
+    if (pending.length === 0 || socket?.readyState !== WebSocket.OPEN) return;
+    socket.send(JSON.stringify(pending));
+    pending = [];
+  };
+
+  const connect = () => {
+    if (stopped) return;
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    socket = new WebSocket(`${protocol}://${window.location.host}/ws/telemetry`);
+    socket.onclose = () => {
+      socket = null;
+      if (!stopped) reconnectTimer = setTimeout(connect, RECONNECT_DELAY_MS);
+    };
+  };
+
+  const onVisibility = () => {
+    if (document.visibilityState === 'hidden') record('tab_switch');
+  };
+  const onBlur = () => record('focus_loss');
+  const onFullscreen = () => {
+    if (!document.fullscreenElement) record('fullscreen_exit');
+  };
+  const onPaste = () => record('paste');
+
+  document.addEventListener('visibilitychange', onVisibility);
+  window.addEventListener('blur', onBlur);
+  document.addEventListener('fullscreenchange', onFullscreen);
+  document.addEventListener('paste', onPaste);
+  const flushTimer = setInterval(flush, FLUSH_INTERVAL_MS);
+  connect();
+
+  return () => {
+    stopped = true;
+    flush();
+    clearInterval(flushTimer);
+    if (reconnectTimer) clearTimeout(reconnectTimer);
+    document.removeEventListener('visibilitychange', onVisibility);
+    window.removeEventListener('blur', onBlur);
+    document.removeEventListener('fullscreenchange', onFullscreen);
+    document.removeEventListener('paste', onPaste);
+    socket?.close();
+  };
+};
@@ -56,12 +56,31 @@ export interface MutexResponse {
   message: string;
   timestamp?: number;
   new_holder?: string;
+  fencing_token?: number | null;
+  lease_seconds?: number;
+  lease_remaining_seconds?: number | null;
 }
 
 export interface MutexStatus {
   current_holder: string;
   queue: Array<{ student: string; timestamp: number }>;
   queue_length: number;
+  fencing_token?: number | null;
+  lease_seconds?: number;
+  lease_remaining_seconds?: number | null;
+  leases_expired?: number;
+}
+
+// Pushed with each 'mutex' event: what one operation changed
+export interface MutexChange {
+  current_holder: string;
+  queue_length: number;
+  fencing_token?: number | null;
+  lease_seconds?: number;
+  lease_remaining_seconds?: number | null;
+  leases_expired?: number;
+  enqueued: { student: string; timestamp: number; queue_position: number } | null;
+  removed: string | null;
 }
 
 // Task 6: Exam Processing Types
@@ -81,6 +100,8 @@ export interface ExamResponse {
   student_id?: string;
   questions?: ExamQuestion[];
   marks?: number;
+  deadline_epoch?: number;
+  remaining_seconds?: number;
   message: string;
 }
 
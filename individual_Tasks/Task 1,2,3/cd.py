@@ -5,11 +5,12 @@ import time
 import sys
 import os
 sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
-from utils import send_json, recv_json
+from utils import send_json, recv_json, offer_framing, accept_framing
 
 TEACHER_ADDR = ("127.0.0.1", 5000)
 CD_HOST = "127.0.0.1"
 CD_PORT = 5002
+CLASSROOM = "default"  # python cd.py [classroom] [port] - Teacher routes by classroom
 
 students_names = {
     58: "Hussain", 59: "Saish", 65: "Khushal", 75: "Hasnain", 68: "Amritesh"
@@ -87,7 +88,8 @@ def cd_server():
     try:
         while True:
             sock, addr = server.accept()
-            # Expect CN to send an initial role declaration
+            # Expect CN to send an initial role declaration (after an optional framing offer)
+            accept_framing(sock)
             role_msg = recv_json(sock)
             role = role_msg.get("role") if isinstance(role_msg, dict) else "CN"
             threading.Thread(target=handle_cn_connection, args=(sock, addr), daemon=True).start()
@@ -136,8 +138,9 @@ def connect_to_teacher_and_listen():
         try:
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             s.connect(TEACHER_ADDR)
+            offer_framing(s)
             # Identify to Teacher
-            send_json(s, {"role": "CD"})
+            send_json(s, {"role": "CD", "classroom": CLASSROOM})
             teacher_sock = s
             print(f"[CD] Connected to Teacher at {TEACHER_ADDR}")
             teacher_listener_loop(s)
@@ -155,6 +158,10 @@ def connect_to_teacher_and_listen():
         time.sleep(1)
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        CLASSROOM = sys.argv[1]
+    if len(sys.argv) > 2:
+        CD_PORT = int(sys.argv[2])
     try:
         # Start thread to connect to teacher and listen
         threading.Thread(target=connect_to_teacher_and_listen, daemon=True).start()
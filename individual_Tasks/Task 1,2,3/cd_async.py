@@ -0,0 +1,119 @@
+# cd_async.py
+# asyncio version of cd.py: same JSON message protocol, one thread. Serves
+# any number of CN connections and keeps one Teacher connection for its
+# classroom (python cd_async.py [classroom] [port]).
+import asyncio
+import sys
+sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
+from utils import async_send_json, async_recv_json, async_offer_framing, async_accept_framing
+
+TEACHER_ADDR = ("127.0.0.1", 5000)
+CD_HOST = "127.0.0.1"
+CD_PORT = 5002
+
+students_names = {
+    58: "Hussain", 59: "Saish", 65: "Khushal", 75: "Hasnain", 68: "Amritesh"
+}
+
+classroom = "default"
+violations = {}          # track violations per roll
+terminated_students = set()
+cn_writers = set()       # connected CN streams
+
+async def handle_cn_connection(reader, writer):
+    addr = writer.get_extra_info("peername")
+    await async_accept_framing(reader, writer)
+    await async_recv_json(reader)  # role declaration
+    cn_writers.add(writer)
+    print(f"[CD] CN connected from {addr}")
+    try:
+        while True:
+            msg = await async_recv_json(reader)
+            if not msg:
+                break
+
+            # Expect violation messages or exam_terminated commands
+            if "roll" in msg and "warning" in msg:
+                roll = msg.get("roll")
+                name = students_names.get(roll, "Unknown")
+                if roll not in terminated_students:
+                    violations[roll] = violations.get(roll, 0) + 1
+                    count = violations[roll]
+                    if count == 1:
+                        print(f"[CD] WARNING → {name} (Roll {roll}): Violation 1 - {msg.get('warning')}")
+                    elif count == 2:
+                        print(f"[CD] TERMINATED → {name} (Roll {roll}) due to 2nd violation (marks = 0)")
+                        terminated_students.add(roll)
+                await async_send_json(writer, {"ack_rn": roll, "ack_type": "question"})
+
+            elif msg.get("command") == "exam_terminated":
+                # Ask CN to request marks from teacher; the teacher sends them to CD directly
+                print(f"[CD] Received exam_terminated for roll {msg.get('roll')}, will request exam_over sequence.")
+                await async_send_json(writer, {"command": "exam_over_request"})
+            else:
+                print(f"[CD] Unknown message from CN: {msg}")
+    except ConnectionError:
+        pass
+    finally:
+        cn_writers.discard(writer)
+        writer.close()
+        print("[CD] CN disconnected.")
+
+async def teacher_listener_loop(reader, writer):
+    """
+    Listen for messages from teacher (teacher will send marks_report).
+    """
+    while True:
+        msg = await async_recv_json(reader)
+        if not msg:
+            print("[CD] Lost connection to Teacher.")
+            return
+        if msg.get("command") == "marks_report":
+            print("\n📄 Final Marksheet (via CD):")
+            print(" Roll | Name      | Marks ")
+            print("---------------------------")
+            for roll_str, marks_val in msg.get("marks", {}).items():
+                roll = int(roll_str)
+                name = students_names.get(roll, "Unknown")
+                print(f" {roll:<4} | {name:<9} | {marks_val}")
+            # Acknowledge to every CN and to the teacher, concurrently
+            acks = [async_send_json(cn, {"command": "marks_report_ack"}) for cn in list(cn_writers)]
+            acks.append(async_send_json(writer, {"command": "marks_report_ack"}))
+            await asyncio.gather(*acks, return_exceptions=True)
+            return
+
+async def connect_to_teacher_and_listen():
+    while True:
+        writer = None
+        try:
+            reader, writer = await asyncio.open_connection(*TEACHER_ADDR)
+            await async_offer_framing(reader, writer)
+            await async_send_json(writer, {"role": "CD", "classroom": classroom})
+            print(f"[CD] Connected to Teacher at {TEACHER_ADDR}")
+            await teacher_listener_loop(reader, writer)
+        except OSError as e:
+            print(f"[CD] Could not connect to Teacher: {e}. Retrying in 1s...")
+        finally:
+            if writer is not None:
+                writer.close()
+        await asyncio.sleep(1)
+
+async def main():
+    server = await asyncio.start_server(handle_cn_connection, CD_HOST, CD_PORT, reuse_address=True)
+    print(f"[CD] Server running on {CD_HOST}:{CD_PORT} (waiting for CN)...")
+    teacher_task = asyncio.create_task(connect_to_teacher_and_listen())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        teacher_task.cancel()
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        classroom = sys.argv[1]
+    if len(sys.argv) > 2:
+        CD_PORT = int(sys.argv[2])
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n[CD] Shutting down...")
@@ -4,16 +4,25 @@ import random
 import time
 import threading
 import queue
+from collections import deque
 import sys
 import os
 sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
-from utils import send_json, recv_json
+from utils import send_json, recv_json, offer_framing
 
 TEACHER_ADDR = ("127.0.0.1", 5000)
 CD_ADDR = ("127.0.0.1", 5002)
+CLASSROOM = "default"  # python cn.py [classroom] [cd_port] - Teacher routes by classroom
 
 WARNING = "Please focus, exam in progress!"
 
+# Sliding window: up to WINDOW_SIZE violations awaiting the Teacher's reply;
+# one unanswered for RETRANSMIT_TIMEOUT seconds is sent again (the Teacher
+# answers a repeated counter with its earlier reply instead of re-counting it)
+WINDOW_SIZE = 8
+RETRANSMIT_TIMEOUT = 3.0
+MAX_RETRANSMITS = 5
+
 students_rolls = [58, 59, 65, 75, 68]
 students_names = {
     58: "Hussain", 59: "Saish", 65: "Khushal", 75: "Hasnain", 68: "Amritesh"
@@ -45,30 +54,90 @@ def cd_reader(sock):
             break
         cd_q.put(msg)
 
-def wait_for_teacher_update(counter, timeout=15):
+def handle_teacher_update(msg, t_sock, cd_sock, terminated_students):
     """
-    Wait until teacher_q yields a message with matching counter within timeout seconds.
-    Returns tuple (result, roll) where result is "continue" / "terminated_student" / None.
+    Act on the Teacher's reply to one violation: ack it, and for a termination
+    also forward exam_terminated to CD.
     """
-    waited = 0
-    while waited < timeout:
+    status = msg.get("status")
+    counter = msg.get("counter")
+    roll = msg.get("roll")
+    if status == "terminate" and roll:
+        # Send ack + terminated flag to teacher, and forward exam_terminated to CD
+        try:
+            send_json(t_sock, {"ack_counter": counter, "roll": roll, "terminated": True})
+        except Exception:
+            pass
         try:
-            msg = teacher_q.get(timeout=1)
+            send_json(cd_sock, {"command": "exam_terminated", "roll": roll})
+        except Exception:
+            pass
+        terminated_students.add(roll)
+    elif status in ("noted", "ignored"):
+        try:
+            send_json(t_sock, {"ack_counter": counter, "roll": roll})
+        except Exception:
+            pass
+
+def send_violations_windowed(messages, t_sock, cd_sock, terminated_students):
+    """
+    Send violations with up to WINDOW_SIZE awaiting the Teacher's reply.
+    Replies are matched by counter in any order; a violation unanswered for
+    RETRANSMIT_TIMEOUT seconds is retransmitted to the Teacher (CD already
+    has it - TCP delivered it), up to MAX_RETRANSMITS times.
+    """
+    pending = deque(messages)
+    in_flight = {}  # counter -> [msg, sent_at, retransmits]
+    deferred = []   # other Teacher messages (e.g. marks_report) seen meanwhile
+
+    while pending or in_flight:
+        while pending and len(in_flight) < WINDOW_SIZE:
+            msg = pending.popleft()
+            if msg["roll"] in terminated_students:
+                continue
+            # Send to CD and Teacher
+            try:
+                send_json(cd_sock, msg)
+            except Exception:
+                print("[CN] Failed sending to CD.")
+            try:
+                send_json(t_sock, msg)
+            except Exception:
+                print("[CN] Failed sending to Teacher.")
+            in_flight[msg["counter"]] = [msg, time.time(), 0]
+        if not in_flight:
+            continue
+
+        oldest = min(entry[1] for entry in in_flight.values())
+        try:
+            reply = teacher_q.get(timeout=max(0.0, oldest + RETRANSMIT_TIMEOUT - time.time()))
         except queue.Empty:
-            waited += 1
+            now = time.time()
+            for counter, entry in list(in_flight.items()):
+                if now - entry[1] < RETRANSMIT_TIMEOUT:
+                    continue
+                if entry[2] >= MAX_RETRANSMITS:
+                    print(f"[CN] No reply for violation #{counter} (roll {entry[0]['roll']}), giving up.")
+                    del in_flight[counter]
+                    continue
+                entry[1] = now
+                entry[2] += 1
+                print(f"[CN] Retransmitting violation #{counter} (attempt {entry[2] + 1})")
+                try:
+                    send_json(t_sock, entry[0])
+                except Exception:
+                    print("[CN] Failed sending to Teacher.")
             continue
-        if msg.get("counter") == counter:
-            status = msg.get("status")
-            roll = msg.get("roll")
-            if status == "noted":
-                # send ack back to teacher (ack_counter)
-                # The ack should be sent over the teacher socket, but we don't have direct access here.
-                # Store ack request by returning result and letting main thread send it.
-                return "continue", roll
-            elif status == "terminate":
-                return "terminated_student", roll
-        # ignore other teacher messages here (like marks_report)
-    return None, None
+
+        if "counter" not in reply:
+            deferred.append(reply)
+            continue
+        if in_flight.pop(reply["counter"], None) is not None:
+            handle_teacher_update(reply, t_sock, cd_sock, terminated_students)
+        # else: a late reply to a retransmitted violation - already handled
+
+    for msg in deferred:
+        teacher_q.put(msg)
 
 def wait_for_cd_exam_over_request(timeout=15, cd_sock=None):
     """
@@ -117,7 +186,8 @@ def main():
         except Exception as e:
             print(f"[CN] Waiting for Teacher at {TEACHER_ADDR}... ({e})")
             time.sleep(1)
-    send_json(t_sock, {"role": "CN"})
+    offer_framing(t_sock)
+    send_json(t_sock, {"role": "CN", "classroom": CLASSROOM})
     threading.Thread(target=teacher_reader, args=(t_sock,), daemon=True).start()
 
     # Connect to CD (server)
@@ -129,7 +199,8 @@ def main():
         except Exception as e:
             print(f"[CN] Waiting for CD server at {CD_ADDR}... ({e})")
             time.sleep(1)
-    send_json(cd_sock, {"role": "CN"})
+    offer_framing(cd_sock)
+    send_json(cd_sock, {"role": "CN", "classroom": CLASSROOM})
     threading.Thread(target=cd_reader, args=(cd_sock,), daemon=True).start()
 
     nums = []
@@ -146,57 +217,20 @@ def main():
             nums.append(roll)
             counts[roll] = counts.get(roll, 0) + 1
 
+    messages = []
     for roll in nums:
-        if roll in terminated_students:
-            continue
-
         counter += 1
         violations_count[roll] = violations_count.get(roll, 0) + 1
-        question_no = random.randint(1, 50)
-
-        msg = {
+        messages.append({
             "roll": roll,
             "name": students_names[roll],
             "warning": WARNING,
             "counter": counter,
-            "question_no": question_no,
+            "question_no": random.randint(1, 50),
             "violation_no": violations_count[roll]
-        }
-
-        # Send to CD and Teacher
-        try:
-            send_json(cd_sock, msg)
-        except Exception:
-            print("[CN] Failed sending to CD.")
-        try:
-            send_json(t_sock, msg)
-        except Exception:
-            print("[CN] Failed sending to Teacher.")
-
-        # Wait for teacher update for this counter
-        result, affected_roll = wait_for_teacher_update(counter, timeout=15)
-        if result == "continue":
-            # send ack to teacher for this counter
-            try:
-                send_json(t_sock, {"ack_counter": counter, "roll": roll})
-            except Exception:
-                pass
-        elif result == "terminated_student" and affected_roll:
-            # Send ack + terminated flag to teacher, and forward exam_terminated to CD
-            try:
-                send_json(t_sock, {"ack_counter": counter, "roll": affected_roll, "terminated": True})
-            except Exception:
-                pass
-            try:
-                send_json(cd_sock, {"command": "exam_terminated", "roll": affected_roll})
-            except Exception:
-                pass
-            terminated_students.add(affected_roll)
-        else:
-            # Timeout or nothing -> ignore and continue
-            pass
+        })
 
-        time.sleep(2)
+    send_violations_windowed(messages, t_sock, cd_sock, terminated_students)
 
     # Now wait for CD's exam_over_request (CD will request CN to ask teacher for marks)
     got = wait_for_cd_exam_over_request(timeout=15)
@@ -222,6 +256,10 @@ def main():
         pass
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        CLASSROOM = sys.argv[1]
+    if len(sys.argv) > 2:
+        CD_ADDR = (CD_ADDR[0], int(sys.argv[2]))
     try:
         main()
     except KeyboardInterrupt:
@@ -0,0 +1,182 @@
+# cn_async.py
+# asyncio version of cn.py: same JSON message protocol, one thread, no
+# polling. Teacher replies resolve per-counter futures as they arrive, so up
+# to WINDOW_SIZE violations are in flight (python cn_async.py [classroom] [cd_port]).
+import asyncio
+import random
+import sys
+sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
+from utils import async_send_json, async_recv_json, async_offer_framing
+
+TEACHER_ADDR = ("127.0.0.1", 5000)
+CD_ADDR = ("127.0.0.1", 5002)
+
+WARNING = "Please focus, exam in progress!"
+
+# Same sliding window as cn.py
+WINDOW_SIZE = 8
+RETRANSMIT_TIMEOUT = 3.0
+MAX_RETRANSMITS = 5
+EXAM_OVER_TIMEOUT = 15
+
+students_rolls = [58, 59, 65, 75, 68]
+students_names = {
+    58: "Hussain", 59: "Saish", 65: "Khushal", 75: "Hasnain", 68: "Amritesh"
+}
+
+class CNNode:
+    def __init__(self, classroom):
+        self.classroom = classroom
+        self.pending = {}  # counter -> Future resolved by the Teacher's reply
+        self.terminated_students = set()
+        self.exam_over = asyncio.Event()
+        self.marks_report = asyncio.get_running_loop().create_future()
+
+    async def connect(self, addr, label):
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(*addr)
+                await async_offer_framing(reader, writer)
+                await async_send_json(writer, {"role": "CN", "classroom": self.classroom})
+                return reader, writer
+            except OSError as e:
+                print(f"[CN] Waiting for {label} at {addr}... ({e})")
+                await asyncio.sleep(1)
+
+    async def teacher_reader(self, reader):
+        while True:
+            msg = await async_recv_json(reader)
+            if not msg:
+                print("[CN] Disconnected from Teacher.")
+                break
+            if "counter" in msg:
+                future = self.pending.get(msg["counter"])
+                if future is not None and not future.done():
+                    future.set_result(msg)
+            elif msg.get("command") == "marks_report" and not self.marks_report.done():
+                self.marks_report.set_result(msg)
+
+    async def cd_reader(self, reader):
+        while True:
+            msg = await async_recv_json(reader)
+            if not msg:
+                print("[CN] Disconnected from CD.")
+                break
+            if msg.get("command") == "exam_over_request":
+                self.exam_over.set()
+
+    async def send_violation(self, msg, window):
+        """Send one violation and wait for the Teacher's reply, retransmitting on timeout"""
+        async with window:
+            if msg["roll"] in self.terminated_students:
+                return
+            counter = msg["counter"]
+            future = self.pending[counter] = asyncio.get_running_loop().create_future()
+            try:
+                try:
+                    await async_send_json(self.cd_writer, msg)
+                except Exception:
+                    print("[CN] Failed sending to CD.")
+                for attempt in range(MAX_RETRANSMITS + 1):
+                    if attempt:
+                        print(f"[CN] Retransmitting violation #{counter} (attempt {attempt + 1})")
+                    try:
+                        await async_send_json(self.t_writer, msg)
+                    except Exception:
+                        print("[CN] Failed sending to Teacher.")
+                    try:
+                        reply = await asyncio.wait_for(asyncio.shield(future), RETRANSMIT_TIMEOUT)
+                        break
+                    except asyncio.TimeoutError:
+                        continue
+                else:
+                    print(f"[CN] No reply for violation #{counter} (roll {msg['roll']}), giving up.")
+                    return
+            finally:
+                del self.pending[counter]
+            await self.handle_teacher_update(reply)
+
+    async def handle_teacher_update(self, msg):
+        status = msg.get("status")
+        counter = msg.get("counter")
+        roll = msg.get("roll")
+        if status == "terminate" and roll:
+            # Ack + terminated flag to teacher, and forward exam_terminated to CD
+            await asyncio.gather(
+                async_send_json(self.t_writer, {"ack_counter": counter, "roll": roll, "terminated": True}),
+                async_send_json(self.cd_writer, {"command": "exam_terminated", "roll": roll}),
+                return_exceptions=True)
+            self.terminated_students.add(roll)
+        elif status in ("noted", "ignored"):
+            try:
+                await async_send_json(self.t_writer, {"ack_counter": counter, "roll": roll})
+            except Exception:
+                pass
+
+    async def run(self):
+        t_reader, self.t_writer = await self.connect(TEACHER_ADDR, "Teacher")
+        cd_reader, self.cd_writer = await self.connect(CD_ADDR, "CD server")
+        readers = [asyncio.create_task(self.teacher_reader(t_reader)),
+                   asyncio.create_task(self.cd_reader(cd_reader))]
+
+        # Generate 5 random question violations (same logic as cn.py)
+        nums = []
+        counts = {}
+        while len(nums) < 5:
+            roll = random.choice(students_rolls)
+            if counts.get(roll, 0) < 2:
+                nums.append(roll)
+                counts[roll] = counts.get(roll, 0) + 1
+
+        violations_count = {}
+        messages = []
+        for counter, roll in enumerate(nums, start=1):
+            violations_count[roll] = violations_count.get(roll, 0) + 1
+            messages.append({
+                "roll": roll,
+                "name": students_names[roll],
+                "warning": WARNING,
+                "counter": counter,
+                "question_no": random.randint(1, 50),
+                "violation_no": violations_count[roll]
+            })
+
+        window = asyncio.Semaphore(WINDOW_SIZE)
+        await asyncio.gather(*(self.send_violation(msg, window) for msg in messages))
+
+        # Wait for CD's exam_over_request, then ask the teacher for marks
+        try:
+            await asyncio.wait_for(self.exam_over.wait(), EXAM_OVER_TIMEOUT)
+            await async_send_json(self.t_writer, {"command": "send_marks"})
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+
+        report = await self.marks_report
+        print("\n📄 Final Marksheet (via CN):")
+        print(" Roll | Name      | Marks ")
+        print("---------------------------")
+        for roll_str, mark in report.get("marks", {}).items():
+            roll = int(roll_str)
+            name = students_names.get(roll, "Unknown")
+            print(f" {roll:<4} | {name:<9} | {mark}")
+        try:
+            await async_send_json(self.t_writer, {"command": "marks_report_ack"})
+        except Exception:
+            pass
+
+        for task in readers:
+            task.cancel()
+        self.t_writer.close()
+        self.cd_writer.close()
+
+async def main(classroom):
+    await CNNode(classroom).run()
+
+if __name__ == "__main__":
+    classroom = sys.argv[1] if len(sys.argv) > 1 else "default"
+    if len(sys.argv) > 2:
+        CD_ADDR = (CD_ADDR[0], int(sys.argv[2]))
+    try:
+        asyncio.run(main(classroom))
+    except KeyboardInterrupt:
+        print("\n[CN] Shutting down...")
@@ -5,93 +5,138 @@ import time
 import sys
 import os
 sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
-from utils import send_json, recv_json
+from utils import send_json, recv_json, accept_framing
 
 HOST = "127.0.0.1"
 PORT = 5000
-
-# Store connected client sockets keyed by role
-clients = {}   # e.g. {"CN": socket, "CD": socket}
-clients_lock = threading.Lock()
+# CN retransmits an unanswered violation for up to 5 x 3s; a cached reply
+# older than this can no longer be asked for again
+REPLY_CACHE_SECONDS = 30.0
 
 students = {
     58: "Hussain", 59: "Saish", 65: "Khushal", 75: "Hasnain", 68: "Amritesh"
 }
 
-# marksheet and violation tracking
-marksheet = {r: 100 for r in students}
-violations = {r: 0 for r in students}
+class Classroom:
+    """
+    One classroom's CN/CD pair and exam state. Peers name their classroom in
+    the role message ({"role": "CN", "classroom": "A"}); peers that don't
+    join "default", so a single classroom works exactly as before.
+    """
+    def __init__(self, classroom_id):
+        self.classroom_id = classroom_id
+        self.clients = {}  # role -> socket, e.g. {"CN": socket, "CD": socket}
+        self.send_locks = {}  # role -> lock serializing writes to that socket
+        self.lock = threading.Lock()
+        # marksheet and violation tracking
+        self.marksheet = {r: 100 for r in students}
+        self.violations = {r: 0 for r in students}
+        # (CN socket, counter) -> (reply, sent_at), oldest first: the reply already
+        # sent for a violation, repeated if CN retransmits it (caller holds lock)
+        self.replies = {}
+
+    def cached_reply(self, conn, counter):
+        now = time.monotonic()
+        while self.replies:
+            oldest = next(iter(self.replies))
+            if now - self.replies[oldest][1] < REPLY_CACHE_SECONDS:
+                break
+            del self.replies[oldest]
+        entry = self.replies.get((conn, counter))
+        return entry[0] if entry else None
+
+# Classrooms keyed by ID; each has its own lock, so rooms never wait on each other
+classrooms = {}
+classrooms_lock = threading.Lock()
 
-def safe_send(role, data):
+def get_classroom(classroom_id):
+    with classrooms_lock:
+        room = classrooms.get(classroom_id)
+        if room is None:
+            room = classrooms[classroom_id] = Classroom(classroom_id)
+        return room
+
+def safe_send(room, role, data):
     """
-    Send JSON to a connected client role if present.
+    Send JSON to a connected client role of the classroom if present.
     """
-    with clients_lock:
-        sock = clients.get(role)
+    with room.lock:
+        sock = room.clients.get(role)
+        send_lock = room.send_locks.get(role)
     if sock:
         try:
-            send_json(sock, data)
+            with send_lock:
+                send_json(sock, data)
         except Exception:
-            print(f"[Teacher] failed to send to {role}")
+            print(f"[Teacher] failed to send to {role} ({room.classroom_id})")
 
-def handle_violation_msg(msg):
+def handle_violation_msg(room, conn, msg):
     roll = msg.get("roll")
     question_no = msg.get("question_no", -1)
     counter = msg.get("counter")  # CN supplies counter
-    if roll not in violations:
-        print(f"[Teacher] Unknown roll {roll} received, ignoring.")
-        return
-    violations[roll] += 1
-    vcount = violations[roll]
-
-    if vcount == 1:
-        marksheet[roll] = 50
-        status = "noted"
-    elif vcount == 2:
-        marksheet[roll] = 0
-        status = "terminate"
-    else:
-        print(f"[Teacher] Roll {roll} already terminated → ignoring.")
-        return
-
-    print(f"[Teacher] Violation {vcount} for roll {roll} on Q{question_no}, percentage={marksheet[roll]}")
+    with room.lock:
+        reply = room.cached_reply(conn, counter)
+        if reply is None:
+            if roll not in room.violations:
+                print(f"[Teacher] Unknown roll {roll} received, ignoring.")
+                vcount = 0
+                status = "ignored"
+            elif room.violations[roll] >= 2:
+                print(f"[Teacher] Roll {roll} already terminated → ignoring.")
+                vcount = room.violations[roll]
+                status = "ignored"
+            else:
+                room.violations[roll] += 1
+                vcount = room.violations[roll]
+                if vcount == 1:
+                    room.marksheet[roll] = 50
+                    status = "noted"
+                else:
+                    room.marksheet[roll] = 0
+                    status = "terminate"
+                print(f"[Teacher] [{room.classroom_id}] Violation {vcount} for roll {roll} on Q{question_no}, "
+                      f"percentage={room.marksheet[roll]}")
 
-    # Reply to CN (must include the same counter so CN can match)
-    reply = {
-        "counter": counter,
-        "roll": roll,
-        "violation": vcount,
-        "question_no": question_no,
-        "percentage": marksheet[roll],
-        "status": status
-    }
-    safe_send("CN", reply)
+            # Reply to CN (must include the same counter so CN can match)
+            reply = {
+                "counter": counter,
+                "roll": roll,
+                "violation": vcount,
+                "question_no": question_no,
+                "percentage": room.marksheet.get(roll),
+                "status": status
+            }
+            if counter is not None:
+                room.replies[(conn, counter)] = (reply, time.monotonic())
+        # else: retransmission - repeat the earlier reply, don't count the violation twice
+    safe_send(room, "CN", reply)
 
-def handle_command(msg):
+def handle_command(room, msg):
     cmd = msg.get("command")
     if cmd == "send_marks":
-        print("[Teacher] Preparing final marksheet...")
-        # convert keys to strings (to mimic original json structure)
-        report = {"command": "marks_report", "marks": {str(k): v for k, v in marksheet.items()}}
-        # send to CN and CD if connected
-        safe_send("CN", report)
-        safe_send("CD", report)
-        print("[Teacher] Marks report sent to CN and CD.")
+        print(f"[Teacher] [{room.classroom_id}] Preparing final marksheet...")
+        with room.lock:
+            # convert keys to strings (to mimic original json structure)
+            report = {"command": "marks_report", "marks": {str(k): v for k, v in room.marksheet.items()}}
+        # send to CN and CD concurrently, so a slow peer doesn't hold up the other
+        senders = [threading.Thread(target=safe_send, args=(room, role, report)) for role in ("CN", "CD")]
+        for t in senders:
+            t.start()
+        for t in senders:
+            t.join()
+        print(f"[Teacher] [{room.classroom_id}] Marks report sent to CN and CD.")
     elif cmd == "marks_report_ack":
-        print("[Teacher] Marks report acknowledged by peer.")
+        print(f"[Teacher] [{room.classroom_id}] Marks report acknowledged by peer.")
     else:
         # other / unknown commands
         print(f"[Teacher] Unknown command received: {cmd}")
 
-def handle_client(sock: socket.socket, addr):
+def handle_client(sock: socket.socket, addr, room, role):
     """
-    Thread per connected client (CN or CD).
-    The first message from client must declare role: {"role":"CN"} or {"role":"CD"}.
-    After that, the client sends regular messages.
+    Thread per connected client (CN or CD) of a classroom.
+    After the role declaration the client sends regular messages.
     """
     try:
-        # The initial role declaration is already read by accept loop and used. But in case not:
-        # We'll just loop reading incoming messages.
         while True:
             msg = recv_json(sock)
             if not msg:
@@ -99,41 +144,56 @@ def handle_client(sock: socket.socket, addr):
             # Process message
             # Accept messages that are either violations (with "roll" & "question_no") or commands
             if "roll" in msg and "question_no" in msg:
-                handle_violation_msg(msg)
+                handle_violation_msg(room, sock, msg)
             elif "command" in msg:
-                handle_command(msg)
+                handle_command(room, msg)
             elif "ack_counter" in msg:
-                # ack from CN for a previously sent teacher->CN message (if any)
-                print(f"[Teacher] Ack received from CN for counter={msg.get('ack_counter')} (roll={msg.get('roll')})")
+                # ack from CN for a previously sent teacher->CN message: it won't be retransmitted
+                with room.lock:
+                    room.replies.pop((sock, msg.get("ack_counter")), None)
+                print(f"[Teacher] [{room.classroom_id}] Ack received from CN for counter={msg.get('ack_counter')} "
+                      f"(roll={msg.get('roll')})")
             else:
                 print(f"[Teacher] Received unknown message: {msg}")
     finally:
-        # Remove this client from clients dict (if present)
-        with clients_lock:
-            for role, csock in list(clients.items()):
-                if csock == sock:
-                    print(f"[Teacher] {role} disconnected.")
-                    del clients[role]
+        # Remove this client from its classroom (if a newer connection hasn't replaced it)
+        with room.lock:
+            if room.clients.get(role) is sock:
+                print(f"[Teacher] {role} disconnected (classroom {room.classroom_id}).")
+                del room.clients[role]
         try:
             sock.close()
         except:
             pass
 
+def register_client(sock: socket.socket, addr):
+    """
+    Read the role declaration ({"role": ..., "classroom": ...}) and hand the
+    socket to its classroom. Runs on the client's own thread, so a peer that
+    is slow to identify itself never holds up the accept loop.
+    """
+    codec = accept_framing(sock)
+    role_msg = recv_json(sock)
+    classroom_id = "default"
+    if isinstance(role_msg, dict) and "role" in role_msg:
+        role = role_msg["role"]
+        classroom_id = str(role_msg.get("classroom", "default"))
+    else:
+        # If client didn't send role, we try to keep going; but mark role by address
+        role = f"unknown_{addr}"
+    room = get_classroom(classroom_id)
+    with room.lock:
+        room.clients[role] = sock
+        room.send_locks[role] = threading.Lock()
+        if role == "CN":
+            room.replies.clear()  # a new CN numbers its violations from scratch
+    print(f"[Teacher] {role} connected from {addr} (classroom {classroom_id}, {codec})")
+    handle_client(sock, addr, room, role)
+
 def accept_loop(server_sock):
     while True:
         sock, addr = server_sock.accept()
-        # Read the initial role declaration (non-blocking expectation)
-        role_msg = recv_json(sock)
-        role = None
-        if isinstance(role_msg, dict) and "role" in role_msg:
-            role = role_msg["role"]
-        else:
-            # If client didn't send role, we try to keep going; but mark role by address
-            role = f"unknown_{addr}"
-        with clients_lock:
-            clients[role] = sock
-        print(f"[Teacher] {role} connected from {addr}")
-        threading.Thread(target=handle_client, args=(sock, addr), daemon=True).start()
+        threading.Thread(target=register_client, args=(sock, addr), daemon=True).start()
 
 def main():
     print("[Teacher] Starting Teacher server on %s:%s..." % (HOST, PORT))
@@ -0,0 +1,169 @@
+# teacher_async.py
+# asyncio version of teacher.py: same JSON message protocol, one thread,
+# one coroutine per connected CN/CD. Peers may add "classroom" to their role
+# message ({"role": "CN", "classroom": "A"}) so one Teacher serves many
+# classrooms, each with its own marksheet; without it they join "default".
+import asyncio
+import sys
+import time
+sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
+from utils import async_send_json, async_recv_json, async_accept_framing
+
+HOST = "127.0.0.1"
+PORT = 5000
+SEND_TIMEOUT = 5.0  # a peer that stops reading can't stall its classroom
+# CN retransmits an unanswered violation for up to 5 x 3s; a cached reply
+# older than this can no longer be asked for again
+REPLY_CACHE_SECONDS = 30.0
+
+students = {
+    58: "Hussain", 59: "Saish", 65: "Khushal", 75: "Hasnain", 68: "Amritesh"
+}
+
+class Classroom:
+    """
+    Per-classroom state: connected peers by role, marksheet, violation counts
+    and the reply sent for each CN counter (CN retransmits unanswered violations).
+    Replies are keyed by (CN writer, counter) and dropped once acked, expired
+    or when a new CN connects.
+    """
+    def __init__(self, classroom_id):
+        self.classroom_id = classroom_id
+        self.peers = {}  # role -> StreamWriter
+        self.marksheet = {r: 100 for r in students}
+        self.violations = {r: 0 for r in students}
+        self.replies = {}  # (CN writer, counter) -> (reply, sent_at), oldest first
+
+    def cached_reply(self, conn, counter):
+        now = time.monotonic()
+        while self.replies:
+            oldest = next(iter(self.replies))
+            if now - self.replies[oldest][1] < REPLY_CACHE_SECONDS:
+                break
+            del self.replies[oldest]
+        entry = self.replies.get((conn, counter))
+        return entry[0] if entry else None
+
+classrooms = {}  # classroom_id -> Classroom
+
+def get_classroom(classroom_id):
+    room = classrooms.get(classroom_id)
+    if room is None:
+        room = classrooms[classroom_id] = Classroom(classroom_id)
+    return room
+
+async def safe_send(room, role, data):
+    """
+    Send JSON to a connected role of the classroom if present.
+    """
+    writer = room.peers.get(role)
+    if writer:
+        try:
+            await async_send_json(writer, data, timeout=SEND_TIMEOUT)
+        except Exception:
+            print(f"[Teacher] failed to send to {role} ({room.classroom_id})")
+
+async def handle_violation_msg(room, conn, msg):
+    roll = msg.get("roll")
+    question_no = msg.get("question_no", -1)
+    counter = msg.get("counter")  # CN supplies counter
+    reply = room.cached_reply(conn, counter)
+    if reply is not None:
+        # Retransmission: repeat the earlier reply, don't count the violation twice
+        await safe_send(room, "CN", reply)
+        return
+    if roll not in room.violations:
+        print(f"[Teacher] Unknown roll {roll} received, ignoring.")
+        vcount = 0
+        status = "ignored"
+    elif room.violations[roll] >= 2:
+        print(f"[Teacher] Roll {roll} already terminated → ignoring.")
+        vcount = room.violations[roll]
+        status = "ignored"
+    else:
+        room.violations[roll] += 1
+        vcount = room.violations[roll]
+        if vcount == 1:
+            room.marksheet[roll] = 50
+            status = "noted"
+        else:
+            room.marksheet[roll] = 0
+            status = "terminate"
+        print(f"[Teacher] [{room.classroom_id}] Violation {vcount} for roll {roll} on Q{question_no}, "
+              f"percentage={room.marksheet[roll]}")
+
+    reply = {
+        "counter": counter,
+        "roll": roll,
+        "violation": vcount,
+        "question_no": question_no,
+        "percentage": room.marksheet.get(roll),
+        "status": status
+    }
+    if counter is not None:
+        room.replies[(conn, counter)] = (reply, time.monotonic())
+    await safe_send(room, "CN", reply)
+
+async def handle_command(room, msg):
+    cmd = msg.get("command")
+    if cmd == "send_marks":
+        print(f"[Teacher] [{room.classroom_id}] Preparing final marksheet...")
+        report = {"command": "marks_report", "marks": {str(k): v for k, v in room.marksheet.items()}}
+        # CN and CD get the report concurrently
+        await asyncio.gather(safe_send(room, "CN", report), safe_send(room, "CD", report))
+        print(f"[Teacher] [{room.classroom_id}] Marks report sent to CN and CD.")
+    elif cmd == "marks_report_ack":
+        print(f"[Teacher] [{room.classroom_id}] Marks report acknowledged by peer.")
+    else:
+        print(f"[Teacher] Unknown command received: {cmd}")
+
+async def handle_client(reader, writer):
+    """
+    One coroutine per connected client (CN or CD). The first message declares
+    the role (and optionally the classroom); after that the client sends
+    violations, commands and acks.
+    """
+    addr = writer.get_extra_info("peername")
+    codec = await async_accept_framing(reader, writer)
+    role_msg = await async_recv_json(reader)
+    if isinstance(role_msg, dict) and "role" in role_msg:
+        role = role_msg["role"]
+    else:
+        role = f"unknown_{addr}"
+    room = get_classroom(str(role_msg.get("classroom", "default")) if isinstance(role_msg, dict) else "default")
+    room.peers[role] = writer
+    if role == "CN":
+        room.replies.clear()  # a new CN numbers its violations from scratch
+    print(f"[Teacher] {role} connected from {addr} (classroom {room.classroom_id}, {codec})")
+    try:
+        while True:
+            msg = await async_recv_json(reader)
+            if not msg:
+                break
+            if "roll" in msg and "question_no" in msg:
+                await handle_violation_msg(room, writer, msg)
+            elif "command" in msg:
+                await handle_command(room, msg)
+            elif "ack_counter" in msg:
+                room.replies.pop((writer, msg.get("ack_counter")), None)  # acked: won't be retransmitted
+                print(f"[Teacher] [{room.classroom_id}] Ack received from CN for counter={msg.get('ack_counter')} "
+                      f"(roll={msg.get('roll')})")
+            else:
+                print(f"[Teacher] Received unknown message: {msg}")
+    finally:
+        if room.peers.get(role) is writer:
+            print(f"[Teacher] {role} disconnected (classroom {room.classroom_id}).")
+            del room.peers[role]
+        writer.close()
+
+async def main():
+    print("[Teacher] Starting Teacher server on %s:%s..." % (HOST, PORT))
+    server = await asyncio.start_server(handle_client, HOST, PORT, reuse_address=True)
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n[Teacher] Shutting down...")
@@ -3,7 +3,7 @@ import time
 import sys
 import os
 sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
-from utils import send_json, recv_json
+from utils import json_reader, accept_framing, connection_pool
 
 HOST = "127.0.0.1"
 MY_PORT = 5001  # change 5002 for s2, 5003 for s3
@@ -14,9 +14,8 @@ student_id = "S1"
 timestamp = 1
 
 def send_to_teacher(msg):
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.connect((HOST, TEACHER_PORT))
-        send_json(s, msg)
+    # Request and release share one pooled connection to the Teacher
+    connection_pool.send((HOST, TEACHER_PORT), msg)
 
 def wait_for_grant():
     server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -26,14 +25,17 @@ def wait_for_grant():
 
     while True:
         conn, addr = server_sock.accept()
-        msg = recv_json(conn)
-        conn.close()
-        if msg and msg.get("type") == "grant" and msg.get("to") == student_id:
-            print(f"[{student_id}] ✅ Granted CS → entering critical section")
-            time.sleep(3)
-            send_to_teacher({"type": "release", "from": student_id})
-            print(f"[{student_id}] 🔓 Released CS")
-            break
+        # The Teacher keeps its pooled connection open: read until the grant arrives
+        with conn:
+            accept_framing(conn)
+            for msg in json_reader(conn):
+                if msg.get("type") == "grant" and msg.get("to") == student_id:
+                    print(f"[{student_id}] ✅ Granted CS → entering critical section")
+                    time.sleep(3)
+                    send_to_teacher({"type": "release", "from": student_id})
+                    print(f"[{student_id}] 🔓 Released CS")
+                    print(f"[{student_id}] Connection pool: {connection_pool.stats()}")
+                    return
 
 if __name__ == "__main__":
     print(f"[{student_id}] Starting...")
@@ -1,10 +1,11 @@
 import heapq
 import time
 import socket
+import threading
 import sys
 import os
 sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
-from utils import send_json, recv_json
+from utils import json_reader, accept_framing, connection_pool
 
 # Configuration: teacher listens on port 5000
 HOST = "127.0.0.1"
@@ -12,6 +13,7 @@ PORT = 5000
 
 request_queue = []
 current_holder = "Teacher"
+state_lock = threading.Lock()  # students' connections are handled concurrently
 
 # Mapping students → ports (these must match student scripts)
 STUDENT_PORTS = {"s1": 5001, "s2": 5002, "s3": 5003}
@@ -26,14 +28,25 @@ def start_server():
 def accept_connections(server_sock):
     while True:
         conn, addr = server_sock.accept()
-        msg = recv_json(conn)
-        if not msg:
-            conn.close()
-            continue
-        handle_message(msg)
-        conn.close()
+        threading.Thread(target=handle_connection, args=(conn,), daemon=True).start()
+
+def handle_connection(conn):
+    # Students keep their pooled connection open: handle every message on it
+    with conn:
+        try:
+            accept_framing(conn)
+            for msg in json_reader(conn):
+                with state_lock:
+                    granted = handle_message(msg)
+                # Send outside the lock: a slow or unreachable student must not
+                # hold up the other students' requests
+                if granted is not None:
+                    send_to_student(granted, {"type": "grant", "to": granted})
+        except OSError as e:
+            print(f"[Teacher] Student connection lost: {e}")
 
 def handle_message(msg):
+    """Update the queue and holder for one message; returns the student newly granted the CS, if any"""
     global current_holder
     if msg["type"] == "request":
         student = msg["from"]
@@ -44,7 +57,7 @@ def handle_message(msg):
             ts, student = heapq.heappop(request_queue)
             current_holder = student
             print(f"[Teacher] Granting CS to {student}")
-            send_to_student(student, {"type": "grant", "to": student})
+            return student
 
     elif msg["type"] == "release":
         student = msg["from"]
@@ -53,16 +66,14 @@ def handle_message(msg):
             ts, next_student = heapq.heappop(request_queue)
             current_holder = next_student
             print(f"[Teacher] Granting CS to {next_student}")
-            send_to_student(next_student, {"type": "grant", "to": next_student})
+            return next_student
         else:
             current_holder = "Teacher"
             print("[Teacher] CS returned to Teacher (queue empty)")
 
 def send_to_student(student, msg):
     port = STUDENT_PORTS[student.lower()]
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.connect((HOST, port))
-        send_json(s, msg)
+    connection_pool.send((HOST, port), msg)
 
 if __name__ == "__main__":
     server = start_server()
@@ -1,10 +1,9 @@
 import socket
 import threading
-import time
 import sys
 import os
 sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
-from utils import send_json, recv_json
+from utils import json_reader, accept_framing, connection_pool
 
 HOST = "127.0.0.1"
 PORT = 9000  # processor port
@@ -40,10 +39,17 @@ lock = threading.Lock()
 STUDENT_PORTS = {"student1": 9002, "student2": 9003, "teacher": 9001}
 
 def handle_client(conn, addr):
+    # Senders keep their pooled connection open: handle every message on it
+    with conn:
+        try:
+            accept_framing(conn)
+            for msg in json_reader(conn):
+                handle_message(msg)
+        except OSError as e:
+            print(f"[Processor] Connection from {addr} lost: {e}")
+
+def handle_message(msg):
     try:
-        msg = recv_json(conn)
-        if not msg:
-            return
         student_id = msg.get("student_id")
         if not student_id:
             return
@@ -91,18 +97,11 @@ def send_to_student(student_id, msg):
     if not port:
         print(f"[Processor] Unknown recipient: {student_id}")
         return
-    # Retry loop if recipient not ready yet
-    for attempt in range(5):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect((HOST, port))
-                send_json(s, msg)
-            return
-        except ConnectionRefusedError:
-            print(f"[Processor] {student_id} not ready yet, retrying...")
-            time.sleep(1)
-        except Exception as e:
-            print(f"[Processor] Could not send to {student_id}: {e}")
+    # The pool retries with backoff if the recipient isn't ready yet
+    try:
+        connection_pool.send((HOST, port), msg)
+    except OSError as e:
+        print(f"[Processor] Could not send to {student_id}: {e}")
 
 def main():
     server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -117,6 +116,7 @@ def main():
             threading.Thread(target=handle_client, args=(conn, addr), daemon=True).start()
         except KeyboardInterrupt:
             print("[Processor] Shutting down...")
+            print(f"[Processor] Connection pool: {connection_pool.stats()}")
             server_sock.close()
             break
 
@@ -4,7 +4,7 @@ import time
 import sys
 import os
 sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
-from utils import send_json, recv_json
+from utils import json_reader, accept_framing, connection_pool
 
 HOST = "127.0.0.1"
 MY_PORT = 9002      # student1 listens on 9002
@@ -18,13 +18,11 @@ def send_to_processor(msg):
     """Send JSON message to processor, retry if processor not ready."""
     while True:
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect((HOST, PROCESSOR_PORT))
-                send_json(s, msg)
+            # The pool reuses one connection and backs off between failed connects
+            connection_pool.send((HOST, PROCESSOR_PORT), msg)
             break
-        except ConnectionRefusedError:
-            print(f"[{STUDENT_ID}] Processor not ready, retrying in 1s...")
-            time.sleep(1)
+        except OSError:
+            print(f"[{STUDENT_ID}] Processor not ready, retrying...")
 
 def listen_processor():
     server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -34,26 +32,26 @@ def listen_processor():
     print(f"[{STUDENT_ID}] Listening on port {MY_PORT} for processor messages")
     while True:
         conn, addr = server_sock.accept()
-        msg = recv_json(conn)
-        conn.close()
-        if not msg:
-            continue
-        msg_type = msg.get("type")
-        if msg_type == "questions":
-            qs = msg.get("questions", [])
-            print("[Exam Started! Answer the MCQs (A/B/C/D)]")
-            for i, q in enumerate(qs):
-                print(f"Q{i+1}: {q['q']}")
-                for opt in q['options']:
-                    print("   ", opt)
-                ans = input("Your answer: ").strip().upper()
-                answers.append(ans)
-            # Submit after input
-            send_to_processor({"type": "submit_exam", "student_id": STUDENT_ID, "answers": answers})
-        elif msg_type == "submission_status":
-            print(f"[{STUDENT_ID}] Submission: {msg.get('status')}")
-        elif msg_type == "marks_released":
-            print(f"[{STUDENT_ID}] Marks released: {msg.get('marks')}")
+        # The processor keeps its pooled connection open: handle every message on it
+        with conn:
+            accept_framing(conn)
+            for msg in json_reader(conn):
+                msg_type = msg.get("type")
+                if msg_type == "questions":
+                    qs = msg.get("questions", [])
+                    print("[Exam Started! Answer the MCQs (A/B/C/D)]")
+                    for i, q in enumerate(qs):
+                        print(f"Q{i+1}: {q['q']}")
+                        for opt in q['options']:
+                            print("   ", opt)
+                        ans = input("Your answer: ").strip().upper()
+                        answers.append(ans)
+                    # Submit after input
+                    send_to_processor({"type": "submit_exam", "student_id": STUDENT_ID, "answers": answers})
+                elif msg_type == "submission_status":
+                    print(f"[{STUDENT_ID}] Submission: {msg.get('status')}")
+                elif msg_type == "marks_released":
+                    print(f"[{STUDENT_ID}] Marks released: {msg.get('marks')}")
 
 if __name__ == "__main__":
     # start listener thread
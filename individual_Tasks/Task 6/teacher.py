@@ -4,7 +4,7 @@ import time
 import sys
 import os
 sys.path.append(r"C:\Users\Saish\Documents\Github\Exam-System")
-from utils import send_json, recv_json
+from utils import json_reader, accept_framing, connection_pool
 
 HOST = "127.0.0.1"
 TEACHER_PORT = 9001  # teacher listens here
@@ -15,11 +15,10 @@ STUDENT_IDS = ["student1", "student2"]
 released = set()
 
 def send_to_processor(msg):
+    # Status polls and releases share one pooled connection to the processor
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.connect((HOST, PROCESSOR_PORT))
-            send_json(s, msg)
-    except Exception as e:
+        connection_pool.send((HOST, PROCESSOR_PORT), msg)
+    except OSError as e:
         print(f"[Teacher] Could not send to processor: {e}")
 
 def listen_processor():
@@ -32,25 +31,34 @@ def listen_processor():
 
     while True:
         conn, addr = server_sock.accept()
-        msg = recv_json(conn)
-        conn.close()
-        if not msg:
-            continue
-        msg_type = msg.get("type")
-        student_id = msg.get("student_id")
+        threading.Thread(target=handle_processor_connection, args=(conn,), daemon=True).start()
 
-        if msg_type == "status":
-            status = msg.get("status")
-            print(f"[Teacher] Status of {student_id}: {status}")
-            if status == "Exam submitted" and student_id not in released:
-                # automatically release marks
-                print(f"[Teacher] Releasing marks for {student_id}")
-                send_to_processor({"type": "release_marks", "student_id": student_id})
-                released.add(student_id)
+def handle_processor_connection(conn):
+    # The processor keeps its pooled connection open: handle every message on it
+    with conn:
+        try:
+            accept_framing(conn)
+            for msg in json_reader(conn):
+                handle_processor_message(msg)
+        except OSError as e:
+            print(f"[Teacher] Processor connection lost: {e}")
 
-        elif msg_type == "marks_released":
-            marks = msg.get("marks")
-            print(f"[Teacher] Marks released for {student_id}: {marks}")
+def handle_processor_message(msg):
+    msg_type = msg.get("type")
+    student_id = msg.get("student_id")
+
+    if msg_type == "status":
+        status = msg.get("status")
+        print(f"[Teacher] Status of {student_id}: {status}")
+        if status == "Exam submitted" and student_id not in released:
+            # automatically release marks
+            print(f"[Teacher] Releasing marks for {student_id}")
+            send_to_processor({"type": "release_marks", "student_id": student_id})
+            released.add(student_id)
+
+    elif msg_type == "marks_released":
+        marks = msg.get("marks")
+        print(f"[Teacher] Marks released for {student_id}: {marks}")
 
 def poll_students():
     """Periodically ask processor for student status"""
@@ -62,6 +70,7 @@ def poll_students():
             send_to_processor({"type": "get_status", "student_id": student_id})
         time.sleep(2)
     print("[Teacher] Marks released for all students.")
+    print(f"[Teacher] Connection pool: {connection_pool.stats()}")
 
 if __name__ == "__main__":
     # start listener thread
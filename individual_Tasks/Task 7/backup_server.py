@@ -10,6 +10,11 @@ import threading
 import json
 import time
 import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from utils import json_reader
 
 # ---------------- Config ----------------
 HOST = "127.0.0.1"   # Run on localhost
@@ -35,16 +40,12 @@ def send_json(sock, obj):
     sock.sendall(data)
 
 def recv_json(sock, timeout=None):
+    # Buffered per-socket reader: messages arriving together are all kept
     sock.settimeout(timeout)
-    buf = b""
-    while True:
-        chunk = sock.recv(4096)
-        if not chunk:
-            raise ConnectionError("Socket closed")
-        buf += chunk
-        if b"\n" in buf:
-            line, rest = buf.split(b"\n", 1)
-            return json.loads(line.decode("utf-8"))
+    msg = json_reader(sock).recv_json()
+    if msg is None:
+        raise ConnectionError("Socket closed")
+    return msg
 
 def handle_client(conn, addr):
     try:
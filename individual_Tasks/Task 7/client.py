@@ -6,9 +6,14 @@ Client Simulator
 
 import socket
 import threading
-import json
 import time
 import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+import utils
+from utils import json_reader, offer_framing
 
 # ---------------- Config ----------------
 MAIN_HOST = "127.0.0.1"  # Main server IP (localhost)
@@ -34,25 +39,22 @@ logging.basicConfig(
 )
 
 def send_json(sock, obj):
-    data = (json.dumps(obj) + "\n").encode("utf-8")
-    sock.sendall(data)
+    # Newline JSON, or frames if the connection negotiated a codec
+    utils.send_json(sock, obj)
 
 def recv_json(sock, timeout=None):
+    # Buffered per-socket reader: messages arriving together are all kept
     sock.settimeout(timeout)
-    buf = b""
-    while True:
-        chunk = sock.recv(4096)
-        if not chunk:
-            raise ConnectionError("Socket closed")
-        buf += chunk
-        if b"\n" in buf:
-            line, rest = buf.split(b"\n", 1)
-            return json.loads(line.decode("utf-8"))
+    msg = json_reader(sock).recv_json()
+    if msg is None:
+        raise ConnectionError("Socket closed")
+    return msg
 
 def student_thread(student_id, start_barrier):
     try:
         logging.info(f"{student_id} connecting...")
         sock = socket.create_connection((MAIN_HOST, MAIN_PORT), timeout=10)
+        offer_framing(sock)
         start_barrier.wait()
         submit_payload = {"answers_hash": f"hash_of_{student_id}"}
         send_json(sock, {"type": "SUBMIT", "student_id": student_id, "payload": submit_payload})
@@ -9,9 +9,14 @@ Main Server (Load Balancer via Migration) - Final, race-free version
 import socket
 import threading
 import queue
-import json
 import logging
 import time
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+import utils
+from utils import json_reader, accept_framing, forget_reader
 
 # ---------------- Config ----------------
 HOST = "127.0.0.1"       # localhost
@@ -53,21 +58,17 @@ batch_end_sent = threading.Event()   # ensure only one BATCH_END
 
 # ---------------- Helpers ----------------
 def send_json(sock, obj):
-    data = (json.dumps(obj) + "\n").encode("utf-8")
-    sock.sendall(data)
+    # Newline JSON, or frames if the connection negotiated a codec
+    utils.send_json(sock, obj)
 
 
 def recv_json(sock, timeout=None):
+    # Buffered per-socket reader: messages arriving together are all kept
     sock.settimeout(timeout)
-    buf = b""
-    while True:
-        chunk = sock.recv(4096)
-        if not chunk:
-            raise ConnectionError("Socket closed")
-        buf += chunk
-        if b"\n" in buf:
-            line, rest = buf.split(b"\n", 1)
-            return json.loads(line.decode("utf-8"))
+    msg = json_reader(sock).recv_json()
+    if msg is None:
+        raise ConnectionError("Socket closed")
+    return msg
 
 
 def send_to_backup(message):
@@ -147,6 +148,7 @@ def notify_all_clients_submitted():
                     csock.close()
                 except Exception:
                     pass
+                forget_reader(csock)
                 logging.info(f"Notified client {sid} -> SUBMITTED")
         except Exception as e:
             logging.error(f"Error while notifying {sid}: {e}")
@@ -161,6 +163,8 @@ def handle_client(conn, addr):
     student_id = None
     lock = threading.Lock()
     try:
+        conn.settimeout(15)
+        accept_framing(conn)
         msg = recv_json(conn, timeout=15)
         if msg.get("type") != "SUBMIT":
             raise ValueError("Unexpected message")
@@ -262,6 +266,7 @@ def handle_backup_control(conn, addr):
             conn.close()
         except Exception:
             pass
+        forget_reader(conn)
 
 
 def client_listener():
@@ -0,0 +1,235 @@
+# load_driver.py
+# Mixed read/write workload driver for the distributed database.
+# Drives either the XML-RPC coordinator (processor.py) or the unified
+# server's /api/v1/database/* REST endpoints with an open-loop arrival
+# process, Zipfian key skew and optional replica failure injection.
+import argparse
+import bisect
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import xmlrpc.client
+from concurrent.futures import ThreadPoolExecutor
+from dataset import STUDENTS
+
+DEFAULT_REPLICA_URLS = {
+    "R1": "http://localhost:8001",
+    "R2": "http://localhost:8002",
+    "R3": "http://localhost:8003",
+}
+
+
+# ---- Key selection ----
+class ZipfKeys:
+    """Pick keys with P(rank k) proportional to 1 / k**s (s=0 is uniform)."""
+
+    def __init__(self, keys, s=1.0, seed=None):
+        self.keys = list(keys)
+        self.rnd = random.Random(seed)
+        self.rnd.shuffle(self.keys)  # hot keys should not always be the first rolls
+        weights = [1.0 / (k ** s) for k in range(1, len(self.keys) + 1)]
+        total = sum(weights)
+        self.cdf = []
+        acc = 0.0
+        for w in weights:
+            acc += w / total
+            self.cdf.append(acc)
+        self.lock = threading.Lock()
+
+    def next(self):
+        with self.lock:
+            u = self.rnd.random()
+        return self.keys[min(bisect.bisect_left(self.cdf, u), len(self.keys) - 1)]
+
+
+# ---- Targets ----
+class XmlRpcTarget:
+    """processor.py coordinator. Proxies are per-thread (ServerProxy is not thread-safe)."""
+
+    def __init__(self, server, replica_urls):
+        self.server = server
+        self.replica_urls = replica_urls
+        self.local = threading.local()
+
+    def _proxy(self):
+        proxy = getattr(self.local, "proxy", None)
+        if proxy is None:
+            proxy = xmlrpc.client.ServerProxy(self.server, allow_none=True)
+            self.local.proxy = proxy
+        return proxy
+
+    def read(self, rn):
+        return self._proxy().student_read(rn).get("status", "ERROR")
+
+    def write(self, rn, mse, ese):
+        return self._proxy().teacher_update(rn, mse, ese).get("status", "ERROR")
+
+    def set_replica(self, name, online):
+        proxy = xmlrpc.client.ServerProxy(self.replica_urls[name], allow_none=True)
+        proxy.set_online(online)
+
+
+class RestTarget:
+    """Unified server REST API (python_server/unified_exam_server.py)."""
+
+    def __init__(self, server):
+        self.base = server.rstrip("/") + "/api/v1/database"
+
+    def _call(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        req = urllib.request.Request(self.base + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                result = json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError:
+            return "ERROR"
+        return "OK" if result.get("status") == "success" else "ERROR"
+
+    def read(self, rn):
+        return self._call("GET", f"/read/{rn}")
+
+    def write(self, rn, mse, ese):
+        return self._call("POST", "/update", {"roll_number": rn, "mse": mse, "ese": ese})
+
+    def set_replica(self, name, online):
+        self._call("POST", f"/replica/{name}/{'recover' if online else 'fail'}")
+
+
+# ---- Results ----
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []  # (op, phase, status, latency_seconds)
+
+    def add(self, op, phase, status, latency):
+        with self.lock:
+            self.samples.append((op, phase, status, latency))
+
+    def report(self, elapsed):
+        print(f"\n=== Results ({len(self.samples)} requests in {elapsed:.2f}s) ===")
+        groups = [("all", lambda s: True),
+                  ("read", lambda s: s[0] == "read"),
+                  ("write", lambda s: s[0] == "write")]
+        for phase in sorted({s[1] for s in self.samples}):
+            groups.append((f"phase={phase}", lambda s, ph=phase: s[1] == ph))
+        print(f"{'group':<16}{'count':>8}{'thr/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+              f"{'OK%':>8}{'QUEUED%':>9}{'ERROR%':>8}")
+        for label, pred in groups:
+            rows = [s for s in self.samples if pred(s)]
+            if not rows:
+                continue
+            lat = sorted(s[3] * 1000 for s in rows)
+            n = len(rows)
+            by_status = {}
+            for s in rows:
+                by_status[s[2]] = by_status.get(s[2], 0) + 1
+            print(f"{label:<16}{n:>8}{n / elapsed:>10.1f}"
+                  f"{percentile(lat, 50):>10.1f}{percentile(lat, 95):>10.1f}{percentile(lat, 99):>10.1f}"
+                  f"{100.0 * by_status.get('OK', 0) / n:>8.1f}"
+                  f"{100.0 * by_status.get('QUEUED', 0) / n:>9.1f}"
+                  f"{100.0 * by_status.get('ERROR', 0) / n:>8.1f}")
+
+
+# ---- Driver ----
+def run(args):
+    if args.mode == "xmlrpc":
+        target = XmlRpcTarget(args.server, dict(DEFAULT_REPLICA_URLS, **args.replica_url))
+    else:
+        target = RestTarget(args.server)
+
+    keys = ZipfKeys([rn for rn, _ in STUDENTS], s=args.zipf, seed=args.seed)
+    rnd = random.Random(args.seed)
+    recorder = Recorder()
+    phase = {"name": "healthy"}
+
+    def one_request(op, rn, marks, scheduled, phase_name):
+        # Latency is measured from the scheduled arrival time, so time spent
+        # waiting for a free client thread counts (no coordinated omission).
+        try:
+            if op == "read":
+                status = target.read(rn)
+            else:
+                status = target.write(rn, *marks)
+        except Exception:
+            status = "ERROR"
+        recorder.add(op, phase_name, status, time.perf_counter() - scheduled)
+
+    events = []
+    if args.fail_replica:
+        events.append((args.fail_at * args.duration, args.fail_replica, False, "degraded"))
+        if args.recover_at is not None:
+            events.append((args.recover_at * args.duration, args.fail_replica, True, "recovered"))
+
+    print(f"=== Load: {args.mode} {args.server} rate={args.rate}/s duration={args.duration}s "
+          f"clients={args.clients} read_ratio={args.read_ratio} zipf={args.zipf} ===")
+    start = time.perf_counter()
+    next_arrival = start
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        while True:
+            now = time.perf_counter()
+            elapsed = now - start
+            while events and elapsed >= events[0][0]:
+                _, name, online, label = events.pop(0)
+                try:
+                    target.set_replica(name, online)
+                    print(f"[Driver] t={elapsed:.1f}s replica {name} -> {'online' if online else 'offline'}")
+                except Exception as e:
+                    print(f"[Driver] Failed to toggle replica {name}: {e}")
+                phase["name"] = label
+            if next_arrival - start >= args.duration:
+                break
+            if next_arrival > now:
+                time.sleep(next_arrival - now)
+            # Everything random is drawn here, in arrival order, so --seed replays
+            # the same requests however the worker threads are scheduled
+            op = "read" if rnd.random() < args.read_ratio else "write"
+            marks = (rnd.randint(0, 20), rnd.randint(0, 40)) if op == "write" else None
+            pool.submit(one_request, op, keys.next(), marks, next_arrival, phase["name"])
+            # open loop: Poisson arrivals, independent of response times
+            next_arrival += rnd.expovariate(args.rate)
+
+    if args.fail_replica and args.recover_at is None:
+        try:
+            target.set_replica(args.fail_replica, True)
+        except Exception:
+            pass
+    recorder.report(time.perf_counter() - start)
+
+
+def parse_replica_url(value):
+    name, _, url = value.partition("=")
+    if not url:
+        raise argparse.ArgumentTypeError("expected NAME=URL")
+    return name, url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mixed read/write load driver for the distributed database")
+    parser.add_argument("--mode", choices=["xmlrpc", "rest"], default="xmlrpc")
+    parser.add_argument("--server", default="http://localhost:8000",
+                        help="processor URL (xmlrpc) or unified server base URL (rest)")
+    parser.add_argument("--rate", type=float, default=50.0, help="mean arrivals per second (open loop)")
+    parser.add_argument("--duration", type=float, default=20.0, help="run length in seconds")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent client threads")
+    parser.add_argument("--read-ratio", type=float, default=0.7, help="fraction of requests that are reads")
+    parser.add_argument("--zipf", type=float, default=1.0, help="Zipf exponent for key skew (0 = uniform)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fail-replica", default=None, help="replica to take offline, e.g. R2")
+    parser.add_argument("--fail-at", type=float, default=0.5, help="fraction of the run at which to fail it")
+    parser.add_argument("--recover-at", type=float, default=None, help="fraction of the run at which to recover it")
+    parser.add_argument("--replica-url", type=parse_replica_url, action="append", default=[],
+                        help="override replica XML-RPC URL, NAME=URL (xmlrpc mode)")
+    args = parser.parse_args()
+    args.replica_url = dict(args.replica_url)
+    run(args)
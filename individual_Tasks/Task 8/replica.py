@@ -9,6 +9,7 @@ class Replica:
         self.name = name
         self.chunks = {}            # chunk_id -> list of records
         self.prepare_buffer = {}    # (chunk_id, rn) -> pending fields
+        self.online = True          # toggled by set_online() for failure injection
         print(f"[{self.name}] Replica object created.")
 
     def load_chunk(self, chunk_id, rows):
@@ -19,6 +20,8 @@ class Replica:
 
     def read(self, chunk_id, rn):
         """RPC: Read a record from a specific chunk."""
+        if not self.online:
+            return None
         rows = self.chunks.get(chunk_id)
         if not rows:
             return None
@@ -30,6 +33,8 @@ class Replica:
 
     def prepare(self, chunk_id, rn, fields):
         """RPC: 2PC Prepare Phase."""
+        if not self.online:
+            return False
         if chunk_id not in self.chunks:
             return False
         for r in self.chunks[chunk_id]:
@@ -60,6 +65,12 @@ class Replica:
         print(f"[{self.name}] Aborted write for {rn} in Chunk{chunk_id}.")
         return True
 
+    def set_online(self, online):
+        """RPC: Simulate replica failure/recovery (used by load_driver.py)."""
+        self.online = bool(online)
+        print(f"[{self.name}] Marked {'online' if self.online else 'offline'}.")
+        return True
+
     def get_chunks(self):
         """RPC: For getting final snapshots. Convert integer keys to strings for XML-RPC compatibility."""
         # This converts keys like 0, 1, 2 into strings like "Chunk0", "Chunk1", "Chunk2"
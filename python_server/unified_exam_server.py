@@ -5,16 +5,22 @@ Combines all 8 tasks into a single FastAPI server with REST API endpoints
 """
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi import WebSocket, WebSocketDisconnect
+from fastapi import WebSocket, WebSocketDisconnect, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, List, Optional, Any
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Any, Iterable
 import asyncio
+import os
 import threading
 import time
 import random
 import heapq
 import json
+import bisect
+import csv
+import re
+from array import array
 import logging
 from datetime import datetime
 from collections import deque, defaultdict
@@ -23,6 +29,16 @@ from xmlrpc.server import SimpleXMLRPCServer
 import socket
 import queue
 
+try:
+    import msgpack  # optional: enables ?encoding=msgpack on /ws/session
+except ImportError:
+    msgpack = None
+
+try:
+    import fcntl  # POSIX only: serializes the unix: event bus hub election
+except ImportError:
+    fcntl = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -40,13 +56,26 @@ app.add_middleware(
 
 # ==================== PYDANTIC MODELS ====================
 
+INT32_LIMIT = 2 ** 31  # rolls and question numbers live in signed 32-bit array columns
+
 class ViolationReport(BaseModel):
-    roll: int
+    roll: int = Field(ge=-INT32_LIMIT, lt=INT32_LIMIT)
     name: str
     warning: str
-    question_no: int
+    question_no: int = Field(ge=0, lt=INT32_LIMIT)
     violation_no: int
 
+class RosterStudent(BaseModel):
+    roll: int = Field(ge=-INT32_LIMIT, lt=INT32_LIMIT)
+    name: str
+
+class RosterImport(BaseModel):
+    students: List[RosterStudent]
+    replace: bool = False
+
+class ViolationBatch(BaseModel):
+    violations: List[ViolationReport]
+
 class ClockSyncRequest(BaseModel):
     role: str  # "teacher" or "student"
     time: str  # "HH:MM:SS"
@@ -74,30 +103,80 @@ class DatabaseRead(BaseModel):
 # ==================== GLOBAL STATE ====================
 
 # Task 1-3: Exam Proctoring System
-students_names = {
+DEFAULT_STUDENTS = {
     58: "Hussain", 59: "Saish", 65: "Khushal", 75: "Hasnain", 68: "Amritesh"
 }
-violations = {}
-terminated_students = set()
-marksheet = dict.fromkeys(students_names, 100)
-violation_counters = dict.fromkeys(students_names, 0)
+# Optional "roll,name" CSV loaded at startup instead of DEFAULT_STUDENTS
+ROSTER_FILE = os.environ.get("EXAM_ROSTER_FILE")
+MAX_ROSTER_IMPORT = 200000
 
 # Real-time session (WS) state
-session_active = False
-session_duration_seconds = 0
-session_end_epoch = 0
-session_task = None
-connected_clients = set()  # set[WebSocket]
+# Proctoring state (roster, violation log, timer) is partitioned per exam
+# session (room); requests without ?session_id= use the default session
+DEFAULT_SESSION_ID = "default"
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+SESSION_SCOPED_TOPICS = {"session", "proctor"}  # plus student:<roll>
+# Raw browser signal -> (signals within the window that make a violation, window seconds)
+TELEMETRY_RULES = {
+    "focus_loss": (5, 30.0),
+    "tab_switch": (3, 60.0),
+    "fullscreen_exit": (2, 60.0),
+    "paste": (3, 30.0),
+}
+MAX_TELEMETRY_FRAME = 5000  # signals per WS frame
+# Repeats of the same (roll, question_no, warning) within this many seconds are collapsed
+VIOLATION_DEDUP_SECONDS = float(os.environ.get("EXAM_VIOLATION_DEDUP_SECONDS", "2"))
+SESSION_RESYNC_SECONDS = 30  # clients count down locally; the server only resyncs them
+connected_clients = set()  # set[WSClient]
+WS_SEND_QUEUE_SIZE = 256  # per-client outbound backlog before it is dropped as too slow
+WS_CLOSE_TIMEOUT = 2.0  # seconds to wait for a close handshake with a dropped client
+# Opt-in (?batch=1) frame batching: events queued within the window go out as one frame
+WS_BATCH_WINDOW_SECONDS = 0.015
+WS_BATCH_MAX_EVENTS = 64
+WS_ENCODINGS = {"json", "msgpack"} if msgpack is not None else {"json"}
+# permessage-deflate is negotiated per connection: only clients that offer it
+# in their handshake get compressed frames. EXAM_WS_DEFLATE=0 turns it off when
+# started with `python unified_exam_server.py`; under the uvicorn CLI pass
+# --ws-per-message-deflate false instead.
+WS_PER_MESSAGE_DEFLATE = os.environ.get("EXAM_WS_DEFLATE", "1") not in ("0", "false", "no")
+# Topic subscriptions: "session" (timer/lifecycle), "proctor" (all violations),
+# "mutex", "load_balance", "student:<roll>" (one student's own violations) and
+# "exam:<student_id>" (one student's exam lifecycle).
+WS_TOPICS = {"session", "proctor", "mutex", "load_balance"}
+ws_topic_index = defaultdict(set)  # topic -> set[WSClient]
+ws_wildcard_clients = set()  # default-room clients that never subscribed: every default-room and shared event
+# Resumable streams: every event carries a sequence number, counted per exam
+# session; each session keeps its recent events so a reconnecting client can
+# ask for everything after its last seen `seq` (see ExamSession).
+WS_REPLAY_BUFFER_SIZE = 1024
+# Cross-worker event bus: "local" (single process), "unix:/path/to.sock" or
+# "tcp:127.0.0.1:8765" to relay broadcasts between uvicorn workers.
+WS_BUS_ADDRESS = os.environ.get("EXAM_WS_BUS", "local")
+WS_BUS_RETRY_SECONDS = 0.5
+WS_BUS_PEER_BUFFER_LIMIT = 4 * 1024 * 1024  # bytes queued to a lagging worker before it is cut off
+WS_BUS_DRAIN_TIMEOUT = 2.0  # a hub that takes longer to accept a peer's event is treated as gone
+WS_BUS_PENDING_LIMIT = 1024  # events held during an election; the oldest are dropped beyond this
+ws_event_bus = None
 
 # Task 4: Berkeley Clock Synchronization
 system_times = {}
 clock_sync_participants = set()
 
 # Task 5: Mutual Exclusion
-request_queue = []
+request_queue = None  # MutexQueue, created with the class below
 current_holder = "Teacher"
 mutex_lock = threading.Lock()
 granted_students = set()  # Track which students have been granted CS
+MUTEX_WAIT_MAX_SECONDS = 60  # longest a /mutex/wait long-poll may block
+mutex_waiters = {}  # student_id -> futures of pending /mutex/wait calls, resolved on grant
+# Each grant is a lease: unless renewed, it passes to the next request after
+# MUTEX_LEASE_SECONDS (0 disables expiry), so a crashed holder can't stall the queue
+MUTEX_LEASE_SECONDS = float(os.environ.get("EXAM_MUTEX_LEASE_SECONDS", "30"))
+mutex_fencing_token = 0  # bumped on every grant; stale releases/renewals are rejected
+mutex_lease_deadline = None  # time.monotonic() when the current lease expires
+mutex_lease_wakeup = None  # asyncio.Event waking the lease watcher when the lease changes
+mutex_leases_expired = 0
+mutex_lease_task = None
 
 # Task 6: Exam Processing
 exam_questions = [
@@ -115,6 +194,11 @@ exam_questions = [
 
 exam_status = {}  # student_id -> status
 exam_submissions = {}  # student_id -> {"answers": [], "marks": int, "released": bool}
+exam_drafts = {}  # student_id -> answers saved while the exam is in progress
+EXAM_DURATION_SECONDS = 30 * 60
+exam_accommodations = {}  # student_id -> extra seconds on top of EXAM_DURATION_SECONDS
+exam_deadlines = {}  # student_id -> deadline epoch (seconds) of an exam in progress
+exam_deadline_task = None
 
 # Task 7: Load Balancing
 local_queue = queue.Queue(maxsize=10)
@@ -218,76 +302,594 @@ replica_queues = {replica: {"read": [], "write": []} for replica in REPLICA_NAME
 
 # ==================== TASK 1-3: EXAM PROCTORING ====================
 
-@app.post("/api/v1/violation/report")
-async def report_violation(violation: ViolationReport):
-    """Report a violation for a student (Task 1-3)"""
+class Roster:
+    """Student roster with violation and mark state in typed arrays.
+
+    Students get a dense ID in import order; `index` maps roll -> ID and
+    every per-student field is one slot in a typed array, so state costs
+    ~16 bytes per student plus the UTF-8 name bytes and the roll map entry.
+    """
+
+    def __init__(self, students=()):
+        self.index = {}  # roll -> dense student ID
+        self.rolls = array("i")
+        self.name_starts = array("I")
+        self.name_lengths = array("H")
+        self.name_bytes = bytearray()
+        self.name_garbage = 0  # bytes of name_bytes no longer referenced by a name
+        self.violations = array("H")  # violations counted toward warning/termination
+        self.reported = array("I")  # every report received, including ignored ones
+        self.marks = array("B")  # current marks percentage
+        self.terminated = bytearray()
+        self.extend(students)
+
+    def __len__(self):
+        return len(self.rolls)
+
+    def __contains__(self, roll: int) -> bool:
+        return roll in self.index
+
+    def _store_name(self, sid: int, name: str, replace: bool = False):
+        # Cut on a character boundary so a long name never stores half a character
+        encoded = name.encode("utf-8")[:0xFFFF].decode("utf-8", "ignore").encode("utf-8")
+        if replace:
+            start, old_length = self.name_starts[sid], self.name_lengths[sid]
+            if len(encoded) <= old_length:
+                # Fits where the old name was: overwrite in place
+                self.name_bytes[start:start + len(encoded)] = encoded
+                self.name_lengths[sid] = len(encoded)
+                self.name_garbage += old_length - len(encoded)
+                return
+            self.name_garbage += old_length
+        self.name_starts[sid] = len(self.name_bytes)
+        self.name_lengths[sid] = len(encoded)
+        self.name_bytes += encoded
+        if self.name_garbage > len(self.name_bytes) // 2:
+            self._compact_names()
+
+    def _compact_names(self):
+        """Rewrite name_bytes without the space of replaced names - O(name bytes), amortized by the garbage"""
+        compacted = bytearray()
+        for sid in range(len(self.rolls)):
+            start = self.name_starts[sid]
+            self.name_starts[sid] = len(compacted)
+            compacted += self.name_bytes[start:start + self.name_lengths[sid]]
+        self.name_bytes = compacted
+        self.name_garbage = 0
+
+    def add(self, roll: int, name: str) -> bool:
+        """Add a student; an existing roll only has its name updated. True if added"""
+        sid = self.index.get(roll)
+        if sid is not None:
+            self._store_name(sid, name, replace=True)
+            return False
+        if not -INT32_LIMIT <= roll < INT32_LIMIT:
+            raise ValueError(f"roll {roll} does not fit in 32 bits")
+        sid = len(self.rolls)
+        self.rolls.append(roll)
+        self.name_starts.append(0)
+        self.name_lengths.append(0)
+        self._store_name(sid, name)
+        self.violations.append(0)
+        self.reported.append(0)
+        self.marks.append(100)
+        self.terminated.append(0)
+        self.index[roll] = sid  # only once every column has the student
+        return True
+
+    def extend(self, students) -> int:
+        """Add (roll, name) pairs; returns how many were new"""
+        return sum(1 for roll, name in students if self.add(roll, name))
+
+    def name(self, roll: int) -> str:
+        sid = self.index[roll]
+        start = self.name_starts[sid]
+        return self.name_bytes[start:start + self.name_lengths[sid]].decode("utf-8")
+
+    def reset(self):
+        """Clear all violation state - O(roster size), no per-student objects"""
+        n = len(self.rolls)
+        self.violations = array("H", bytes(2 * n))
+        self.reported = array("I", bytes(4 * n))
+        self.marks = array("B", b"\x64" * n)
+        self.terminated = bytearray(n)
+
+    def state_bytes(self) -> int:
+        arrays = (self.rolls, self.name_starts, self.name_lengths, self.violations, self.reported, self.marks)
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.terminated) + len(self.name_bytes)
+
+    def student_state(self, roll: int) -> Dict[str, Any]:
+        sid = self.index[roll]
+        return {
+            "violation_count": self.violations[sid],
+            "current_marks": self.marks[sid],
+            "terminated": bool(self.terminated[sid])
+        }
+
+    def marksheet(self) -> Dict[int, int]:
+        return dict(zip(self.rolls, self.marks))
+
+    def violation_counts(self) -> Dict[int, int]:
+        """Rolls with at least one counted violation"""
+        return {roll: count for roll, count in zip(self.rolls, self.violations) if count}
+
+    def terminated_rolls(self) -> List[int]:
+        return [roll for roll, flag in zip(self.rolls, self.terminated) if flag]
+
+def load_roster_file(path: str) -> List[tuple]:
+    """Read "roll,name" lines (a non-numeric header line is skipped)"""
+    students = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip().lstrip("-").isdigit():
+                continue
+            roll = int(row[0])
+            if not -INT32_LIMIT <= roll < INT32_LIMIT:
+                logger.warning(f"Skipping roster line with out-of-range roll {roll}")
+                continue
+            students.append((roll, row[1].strip()))
+    return students
+
+class ViolationLog:
+    """Append-only violation event log stored as parallel typed-array columns.
+
+    Each record costs ~26 bytes (timestamp, roll, question, count, outcome,
+    interned warning text and one roll-index entry) instead of a dict.
+    Timestamps never decrease, so time windows are found by bisection, and a
+    per-roll row index serves a student's history without scanning the log.
+    """
+
+    OUTCOMES = ["warning", "terminated", "ignored"]
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.timestamps = array("d")
+        self.rolls = array("i")
+        self.questions = array("i")
+        self.counts = array("H")  # violation count after this report
+        self.outcomes = array("B")  # index into OUTCOMES
+        self.warning_ids = array("I")  # index into self.warnings
+        self.warnings = []  # interned warning texts
+        self.warning_index = {}  # text -> id
+        self.rows_by_roll = {}  # roll -> array("I") of row numbers
+        self.question_totals = defaultdict(int)  # question_no -> reports, all time
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def append(self, roll: int, question_no: int, warning: str, count: int, outcome: str):
+        # Build and check the whole row before touching any column, so a
+        # value that doesn't fit can't leave the columns misaligned
+        if not (-INT32_LIMIT <= roll < INT32_LIMIT and -INT32_LIMIT <= question_no < INT32_LIMIT):
+            raise ValueError("roll and question_no must fit in 32 bits")
+        outcome_id = self.OUTCOMES.index(outcome)
+        count = max(0, min(count, 0xFFFF))
+        now = time.time()
+        if self.timestamps and now < self.timestamps[-1]:
+            now = self.timestamps[-1]  # keep the time column sorted across clock steps
+        warning_id = self.warning_index.get(warning)
+        if warning_id is None:
+            warning_id = self.warning_index[warning] = len(self.warnings)
+            self.warnings.append(warning)
+        row = len(self.timestamps)
+        self.timestamps.append(now)
+        self.rolls.append(roll)
+        self.questions.append(question_no)
+        self.counts.append(count)
+        self.outcomes.append(outcome_id)
+        self.warning_ids.append(warning_id)
+        if roll not in self.rows_by_roll:
+            self.rows_by_roll[roll] = array("I")
+        self.rows_by_roll[roll].append(row)
+        self.question_totals[question_no] += 1
+
+    def record(self, row: int) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamps[row],
+            "roll": self.rolls[row],
+            "question_no": self.questions[row],
+            "warning": self.warnings[self.warning_ids[row]],
+            "violation_count": self.counts[row],
+            "outcome": self.OUTCOMES[self.outcomes[row]]
+        }
+
+    def first_row_since(self, since: float) -> int:
+        return bisect.bisect_left(self.timestamps, since)
+
+    def history(self, roll: int, since: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """A student's reports, oldest first (optionally only those at or after `since`)"""
+        rows = self.rows_by_roll.get(roll, array("I"))
+        start = 0
+        if since is not None:
+            # Row numbers increase with time, so bisect the roll's rows by timestamp
+            lo, hi = 0, len(rows)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.timestamps[rows[mid]] < since:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            start = lo
+        if limit is not None:
+            start = max(start, len(rows) - limit)
+        return [self.record(row) for row in rows[start:]]
+
+    def recent(self, since: float, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """All reports at or after `since`, oldest first"""
+        start = self.first_row_since(since)
+        if limit is not None:
+            start = max(start, len(self.timestamps) - limit)
+        return [self.record(row) for row in range(start, len(self.timestamps))]
+
+    def hotspots(self, since: Optional[float] = None, top: int = 10) -> List[Dict[str, Any]]:
+        """Questions with the most reports, all time or within the window starting at `since`"""
+        if since is None:
+            totals = self.question_totals
+        else:
+            totals = defaultdict(int)
+            for row in range(self.first_row_since(since), len(self.timestamps)):
+                totals[self.questions[row]] += 1
+        ranked = heapq.nlargest(top, totals.items(), key=lambda item: item[1])
+        return [{"question_no": question_no, "violations": count} for question_no, count in ranked]
+
+class TelemetryWindows:
+    """Sliding-window counters turning raw browser signals into violations.
+
+    For each (roll, signal kind) only the arrival times of the last N
+    signals are kept, N being the rule's threshold, so memory per student is
+    bounded by the rules and not by the signal rate. A violation is decided
+    when N signals fall within the rule's window; the window then restarts.
+    """
+
+    def __init__(self):
+        self.windows = {}  # (roll, kind) -> deque of arrival times, maxlen = threshold
+        self.signals = 0
+        self.rejected = 0
+        self.decisions = 0
+
+    def observe(self, roll: int, kind: str, now: float) -> bool:
+        """Record one signal; True if it completes a violation"""
+        rule = TELEMETRY_RULES.get(kind)
+        if rule is None:
+            self.rejected += 1
+            return False
+        threshold, window = rule
+        self.signals += 1
+        times = self.windows.get((roll, kind))
+        if times is None:
+            times = self.windows[(roll, kind)] = deque(maxlen=threshold)
+        times.append(now)
+        if len(times) == threshold and now - times[0] <= window:
+            times.clear()
+            self.decisions += 1
+            return True
+        return False
+
+    def clear(self):
+        self.windows.clear()
+        self.signals = self.rejected = self.decisions = 0
+
+class ViolationDedup:
+    """Collapses repeats of a violation signal within a window.
+
+    Keyed on (roll, question_no, warning). The window starts at the last
+    report that was let through and is not extended by the duplicates, so a
+    signal that keeps firing is still counted once per window. Keys are kept
+    in expiry order, so expired entries are pruned from the front in O(1)
+    amortized and memory stays bounded by the signals of the last window.
+    """
+
+    def __init__(self, window_seconds: float = VIOLATION_DEDUP_SECONDS):
+        self.window_seconds = window_seconds
+        self.expiries = {}  # (roll, question_no, warning) -> monotonic expiry, oldest first
+        self.suppressed = 0
+
+    def admit(self, roll: int, question_no: int, warning: str) -> bool:
+        """True if the report should be applied, False if it duplicates a recent one"""
+        if self.window_seconds <= 0:
+            return True
+        now = time.monotonic()
+        while self.expiries:
+            oldest_key = next(iter(self.expiries))
+            if self.expiries[oldest_key] > now:
+                break
+            del self.expiries[oldest_key]
+        key = (roll, question_no, warning)
+        expiry = self.expiries.get(key)
+        if expiry is not None and expiry > now:
+            self.suppressed += 1
+            return False
+        self.expiries.pop(key, None)
+        self.expiries[key] = now + self.window_seconds
+        return True
+
+    def clear(self):
+        self.expiries.clear()
+        self.suppressed = 0
+
+class ExamSession:
+    """One exam room: its own roster, violation log, timer and WS topics.
+
+    Sessions share nothing, so a reset or timer in one room never touches
+    another. Every mutation runs on the event loop without awaiting, and
+    each session's timer is its own task. The room's WS event stream is its
+    own too: events its clients can see are numbered per room and kept in
+    the room's replay buffer, so a busy room neither evicts another room's
+    history nor makes its `seq` jump.
+    """
+
+    def __init__(self, session_id: str, students=()):
+        self.session_id = session_id
+        self.roster = Roster(students)
+        self.violation_log = ViolationLog()
+        self.telemetry = TelemetryWindows()
+        self.dedup = ViolationDedup()
+        self.active = False
+        self.duration_seconds = 0
+        self.end_epoch = 0
+        self.end_monotonic = 0.0  # event-loop clock deadline matching end_epoch
+        self.wakeup: Optional[asyncio.Event] = None  # wakes the timer task on start/stop/extend
+        self.task: Optional[asyncio.Task] = None
+        self.ws_seq = 0  # seq of the room's latest WS event
+        self.ws_replay = deque(maxlen=WS_REPLAY_BUFFER_SIZE)  # (seq, topics, text)
+        self.ws_replay_floor = 0  # highest seq evicted from ws_replay; older resumes get a snapshot
+
+    def topic(self, topic: str) -> str:
+        return scoped_topic(self.session_id, topic)
+
+    def topics(self, *topics: str) -> tuple:
+        return tuple(self.topic(topic) for topic in topics)
+
+    def reset(self):
+        """Clear violation state - O(room size)"""
+        self.roster.reset()
+        self.violation_log.clear()
+        self.telemetry.clear()
+        self.dedup.clear()
+
+    def replace_roster(self, students):
+        """Swap in a new roster, dropping the violation state keyed to the old rolls"""
+        self.roster = Roster(students)
+        self.violation_log.clear()
+        self.telemetry.clear()
+        self.dedup.clear()
+
+def scoped_topic(session_id: str, topic: str) -> str:
+    """Qualify a session's own topics (`session`, `proctor`, `student:<roll>`) with its ID.
+
+    The default session keeps the bare names, so existing clients are unchanged.
+    """
+    if session_id == DEFAULT_SESSION_ID:
+        return topic
+    if topic in SESSION_SCOPED_TOPICS or topic.startswith("student:"):
+        return f"{session_id}/{topic}"
+    return topic
+
+exam_sessions = {
+    DEFAULT_SESSION_ID: ExamSession(DEFAULT_SESSION_ID,
+                                    load_roster_file(ROSTER_FILE) if ROSTER_FILE else DEFAULT_STUDENTS.items())
+}
+
+def get_exam_session(session_id: str) -> ExamSession:
+    session = exam_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+MAX_VIOLATION_BATCH = 1000
+
+def apply_violation(session: ExamSession, violation: ViolationReport) -> Optional[Dict[str, Any]]:
+    """Apply one violation (first = warning, second = termination).
+
+    Returns the response for the reporter, or None if the roll is unknown.
+    Counted violations also carry the WS event under "event".
+    """
+    roster, violation_log = session.roster, session.violation_log
     roll = violation.roll
-    if roll not in students_names:
-        raise HTTPException(status_code=404, detail="Student not found")
+    sid = roster.index.get(roll)
+    if sid is None:
+        return None
+    if not session.dedup.admit(roll, violation.question_no, violation.warning):
+        return {
+            "status": "duplicate",
+            "message": "Repeat of a violation reported moments ago - ignored",
+            "violation_count": roster.violations[sid],
+            "current_marks": roster.marks[sid]
+        }
+    name = roster.name(roll)
+    roster.reported[sid] += 1
     
-    if roll in terminated_students:
+    if roster.terminated[sid]:
+        violation_log.append(roll, violation.question_no, violation.warning, roster.violations[sid], "ignored")
         return {"status": "ignored", "message": "Student already terminated"}
     
-    violations[roll] = violations.get(roll, 0) + 1
-    violation_counters[roll] += 1
-    count = violations[roll]
+    roster.violations[sid] += 1
+    count = roster.violations[sid]
     
     if count == 1:
-        marksheet[roll] = 50
+        roster.marks[sid] = 50
         status = "warning"
-        message = f"First violation for {students_names[roll]} - marks reduced to 50%"
+        message = f"First violation for {name} - marks reduced to 50%"
     elif count == 2:
-        marksheet[roll] = 0
-        terminated_students.add(roll)
+        roster.marks[sid] = 0
+        roster.terminated[sid] = 1
         status = "terminated"
-        message = f"Second violation for {students_names[roll]} - EXAM TERMINATED, marks = 0%"
+        message = f"Second violation for {name} - EXAM TERMINATED, marks = 0%"
     else:
         status = "ignored"
-        message = f"Student {students_names[roll]} already terminated"
+        message = f"Student {name} already terminated"
     
-    logger.info(f"Violation {count} for {students_names[roll]} (Roll {roll}) on Q{violation.question_no}")
-
-    # Broadcast flag event to WS clients
-    await broadcast_ws_event({
-        "type": "violation",
-        "roll": roll,
-        "name": students_names[roll],
-        "question_no": violation.question_no,
-        "violation_count": count,
-        "current_marks": marksheet[roll]
-    })
+    logger.info(f"Violation {count} for {name} (Roll {roll}) on Q{violation.question_no}")
+    violation_log.append(roll, violation.question_no, violation.warning, count, status)
     
     return {
         "status": status,
         "message": message,
         "violation_count": count,
-        "current_marks": marksheet[roll],
-        "student_name": students_names[roll]
+        "current_marks": roster.marks[sid],
+        "student_name": name,
+        "event": {
+            "type": "violation",
+            "session_id": session.session_id,
+            "roll": roll,
+            "name": name,
+            "question_no": violation.question_no,
+            "violation_count": count,
+            "current_marks": roster.marks[sid]
+        }
+    }
+
+@app.post("/api/v1/violation/report")
+async def report_violation(violation: ViolationReport, session_id: str = DEFAULT_SESSION_ID):
+    """Report a violation for a student (Task 1-3)"""
+    session = get_exam_session(session_id)
+    result = apply_violation(session, violation)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    
+    event = result.pop("event", None)
+    if event is not None:
+        # Broadcast flag event to WS clients
+        await broadcast_ws_event(event, topics=session.topics("proctor", f"student:{violation.roll}"),
+                                 session_id=session.session_id)
+    
+    return result
+
+async def publish_violation_batch(session: ExamSession, events: List[Dict[str, Any]]):
+    """Broadcast a batch of violation events once, on `proctor` and every affected `student:<roll>`.
+
+    Each client gets the single `violation_batch` at most once, however many
+    of its topics it matches; student views pick their own roll's entries.
+    """
+    if not events:
+        return
+    rolls = dict.fromkeys(event["roll"] for event in events)
+    await broadcast_ws_event({"type": "violation_batch", "session_id": session.session_id, "violations": events},
+                             topics=session.topics("proctor", *(f"student:{roll}" for roll in rolls)),
+                             session_id=session.session_id)
+
+@app.post("/api/v1/violation/report-batch")
+async def report_violation_batch(batch: ViolationBatch, session_id: str = DEFAULT_SESSION_ID):
+    """Report many violations in one request (e.g. from a per-room proctoring relay).
+
+    Violations are applied in order with the same warning/termination rules
+    as /violation/report and get one result each. The WS broadcast is
+    coalesced into one `violation_batch` event, published on the proctor
+    feed and the affected students' topics.
+    """
+    if len(batch.violations) > MAX_VIOLATION_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_VIOLATION_BATCH} violations per batch")
+    session = get_exam_session(session_id)
+    
+    results = []
+    events = []
+    for violation in batch.violations:
+        result = apply_violation(session, violation)
+        if result is None:
+            results.append({"roll": violation.roll, "status": "error", "message": "Student not found"})
+            continue
+        event = result.pop("event", None)
+        if event is not None:
+            events.append(event)
+        results.append({"roll": violation.roll, **result})
+    
+    await publish_violation_batch(session, events)
+    
+    return {
+        "status": "processed",
+        "count": len(results),
+        "results": results
     }
 
 @app.get("/api/v1/violation/status/{roll}")
-async def get_violation_status(roll: int):
+async def get_violation_status(roll: int, session_id: str = DEFAULT_SESSION_ID):
     """Get violation status for a student"""
-    if roll not in students_names:
+    roster = get_exam_session(session_id).roster
+    if roll not in roster:
         raise HTTPException(status_code=404, detail="Student not found")
     
     return {
         "roll": roll,
-        "name": students_names[roll],
-        "violation_count": violations.get(roll, 0),
-        "current_marks": marksheet[roll],
-        "terminated": roll in terminated_students
+        "name": roster.name(roll),
+        **roster.student_state(roll)
     }
 
+@app.get("/api/v1/violation/history/{roll}")
+async def get_violation_history(roll: int, minutes: Optional[float] = None, limit: Optional[int] = None,
+                                session_id: str = DEFAULT_SESSION_ID):
+    """Every violation reported for a student, optionally only the last N minutes"""
+    session = get_exam_session(session_id)
+    roster, violation_log = session.roster, session.violation_log
+    if roll not in roster:
+        raise HTTPException(status_code=404, detail="Student not found")
+    since = time.time() - minutes * 60 if minutes is not None else None
+    history = violation_log.history(roll, since=since, limit=limit)
+    return {"roll": roll, "name": roster.name(roll), "count": len(history), "violations": history}
+
+@app.get("/api/v1/violation/recent")
+async def get_recent_violations(minutes: float = 5, limit: Optional[int] = None,
+                                session_id: str = DEFAULT_SESSION_ID):
+    """Violations reported in the last N minutes, across all students"""
+    recent = get_exam_session(session_id).violation_log.recent(time.time() - minutes * 60, limit=limit)
+    return {"minutes": minutes, "count": len(recent), "violations": recent}
+
+@app.get("/api/v1/violation/hotspots")
+async def get_violation_hotspots(minutes: Optional[float] = None, top: int = 10,
+                                 session_id: str = DEFAULT_SESSION_ID):
+    """Questions with the most violations, all time or in the last N minutes"""
+    violation_log = get_exam_session(session_id).violation_log
+    since = time.time() - minutes * 60 if minutes is not None else None
+    return {"minutes": minutes, "hotspots": violation_log.hotspots(since=since, top=top),
+            "total_logged": len(violation_log)}
+
 @app.get("/api/v1/violation/marksheet")
-async def get_marksheet():
+async def get_marksheet(session_id: str = DEFAULT_SESSION_ID):
     """Get final marksheet"""
+    roster = get_exam_session(session_id).roster
     return {
-        "marksheet": marksheet,
-        "violations": violations,
-        "terminated_students": list(terminated_students)
+        "marksheet": roster.marksheet(),
+        "violations": roster.violation_counts(),
+        "terminated_students": roster.terminated_rolls()
     }
 
+@app.put("/api/v1/violation/dedup")
+async def set_violation_dedup(seconds: float, session_id: str = DEFAULT_SESSION_ID):
+    """Set the window within which repeats of the same violation are collapsed (0 disables)"""
+    dedup = get_exam_session(session_id).dedup
+    dedup.window_seconds = max(0.0, seconds)
+    return {"session_id": session_id, "window_seconds": dedup.window_seconds, "suppressed": dedup.suppressed}
+
+@app.post("/api/v1/roster/import")
+async def import_roster(roster_import: RosterImport, session_id: str = DEFAULT_SESSION_ID):
+    """Load students (e.g. a 100k-student roster); existing rolls only get their name updated.
+    replace=true swaps the whole roster and clears the violation state of the old one"""
+    if len(roster_import.students) > MAX_ROSTER_IMPORT:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_ROSTER_IMPORT} students per import")
+    session = get_exam_session(session_id)
+    students = ((student.roll, student.name) for student in roster_import.students)
+    if roster_import.replace:
+        session.replace_roster(students)
+        added = len(session.roster)
+    else:
+        added = session.roster.extend(students)
+    roster = session.roster
+    logger.info(f"Roster import ({session_id}): {added} students added, {len(roster)} total")
+    if roster_import.replace:
+        # Violation history went with the old roster
+        await broadcast_ws_event({"type": "reset", "session_id": session_id},
+                                 topics=session.topics("session", "proctor"), session_id=session_id)
+    return {"status": "imported", "added": added, "total_students": len(roster),
+            "state_bytes": roster.state_bytes()}
+
+@app.get("/api/v1/roster")
+async def get_roster_summary(session_id: str = DEFAULT_SESSION_ID):
+    """Roster size and memory used by per-student state"""
+    roster = get_exam_session(session_id).roster
+    return {"total_students": len(roster), "state_bytes": roster.state_bytes(),
+            "terminated_students": sum(roster.terminated)}
+
 # ==================== TASK 4: BERKELEY CLOCK SYNCHRONIZATION ====================
 
 @app.post("/api/v1/clock/register")
@@ -345,68 +947,362 @@ async def get_clock_status():
 
 # ==================== TASK 5: MUTUAL EXCLUSION ====================
 
+class _QueueNode:
+    __slots__ = ("key", "priority", "left", "right", "size")
+
+    def __init__(self, key):
+        self.key = key
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.size = 1
+
+def _node_size(node: Optional[_QueueNode]) -> int:
+    return node.size if node is not None else 0
+
+class MutexQueue:
+    """Indexed priority queue of critical-section requests.
+
+    A treap (randomized balanced BST) ordered by (timestamp, student_id),
+    with subtree sizes for order statistics, plus a student -> key index.
+    Insert, cancel, reprioritize, pop and exact rank are all O(log n)
+    expected, so duplicate checks and queue positions stay cheap with
+    thousands of waiting students.
+    """
+
+    def __init__(self):
+        self.root: Optional[_QueueNode] = None
+        self.keys: Dict[str, tuple] = {}  # student_id -> (timestamp, student_id)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self.keys
+
+    @staticmethod
+    def _split(node: Optional[_QueueNode], key: tuple):
+        """Split into (keys < key, keys >= key)"""
+        if node is None:
+            return None, None
+        if node.key < key:
+            node.right, right = MutexQueue._split(node.right, key)
+            node.size = 1 + _node_size(node.left) + _node_size(node.right)
+            return node, right
+        left, node.left = MutexQueue._split(node.left, key)
+        node.size = 1 + _node_size(node.left) + _node_size(node.right)
+        return left, node
+
+    @staticmethod
+    def _merge(left: Optional[_QueueNode], right: Optional[_QueueNode]) -> Optional[_QueueNode]:
+        """Join two treaps where every key in `left` is below every key in `right`"""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = MutexQueue._merge(left.right, right)
+            node = left
+        else:
+            right.left = MutexQueue._merge(left, right.left)
+            node = right
+        node.size = 1 + _node_size(node.left) + _node_size(node.right)
+        return node
+
+    def _insert(self, key: tuple):
+        left, right = self._split(self.root, key)
+        self.root = self._merge(self._merge(left, _QueueNode(key)), right)
+
+    def _remove(self, key: tuple):
+        left, right = self._split(self.root, key)
+        _, right = self._split(right, (key[0], key[1] + "\0"))  # drop exactly `key`
+        self.root = self._merge(left, right)
+
+    def push(self, student_id: str, timestamp: int) -> bool:
+        """Queue a request; False if the student is already queued"""
+        if student_id in self.keys:
+            return False
+        key = self.keys[student_id] = (timestamp, student_id)
+        self._insert(key)
+        return True
+
+    def cancel(self, student_id: str) -> bool:
+        key = self.keys.pop(student_id, None)
+        if key is None:
+            return False
+        self._remove(key)
+        return True
+
+    def reprioritize(self, student_id: str, timestamp: int) -> bool:
+        """Move a queued request to a new timestamp; False if not queued"""
+        if not self.cancel(student_id):
+            return False
+        return self.push(student_id, timestamp)
+
+    def pop(self) -> Optional[tuple]:
+        """Remove and return the earliest (timestamp, student_id), or None"""
+        node = self.root
+        if node is None:
+            return None
+        while node.left is not None:
+            node = node.left
+        key = node.key
+        del self.keys[key[1]]
+        self._remove(key)
+        return key
+
+    def rank(self, student_id: str) -> Optional[int]:
+        """0-based position in the queue, or None if not queued"""
+        key = self.keys.get(student_id)
+        if key is None:
+            return None
+        rank = 0
+        node = self.root
+        while node.key != key:
+            if key < node.key:
+                node = node.left
+            else:
+                rank += _node_size(node.left) + 1
+                node = node.right
+        return rank + _node_size(node.left)
+
+    def items(self) -> List[tuple]:
+        """Every (timestamp, student_id) in queue order"""
+        ordered, stack, node = [], [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            ordered.append(node.key)
+            node = node.right
+        return ordered
+
+request_queue = MutexQueue()
+
+def mutex_status_snapshot() -> Dict[str, Any]:
+    """Current mutex state, full queue included (O(n)); call with mutex_lock held"""
+    return {
+        "current_holder": current_holder,
+        "queue": [{"student": student, "timestamp": ts} for ts, student in request_queue.items()],
+        "queue_length": len(request_queue),
+        "granted_students": list(granted_students),
+        **mutex_lease_info(),
+        "leases_expired": mutex_leases_expired
+    }
+
+def mutex_status_change(enqueued: Optional[str] = None, removed: Optional[str] = None) -> Dict[str, Any]:
+    """What one mutex operation changed, for the WS broadcast; call with mutex_lock held.
+
+    O(log n) however long the queue is: the holder, lease and queue length
+    plus the one request added to (`enqueued`, with its position) or taken
+    from (`removed`) the queue. The full listing is only built by
+    GET /mutex/status.
+    """
+    change = {
+        "current_holder": current_holder,
+        "queue_length": len(request_queue),
+        **mutex_lease_info(),
+        "leases_expired": mutex_leases_expired,
+        "enqueued": None,
+        "removed": removed
+    }
+    if enqueued is not None and enqueued in request_queue:
+        timestamp, _ = request_queue.keys[enqueued]
+        change["enqueued"] = {"student": enqueued, "timestamp": timestamp,
+                              "queue_position": request_queue.rank(enqueued) + 1}
+    return change
+
+def mutex_lease_info() -> Dict[str, Any]:
+    """Current holder's fencing token and lease; call with mutex_lock held"""
+    remaining = None
+    if current_holder != "Teacher" and mutex_lease_deadline is not None:
+        remaining = round(max(0.0, mutex_lease_deadline - time.monotonic()), 3)
+    return {
+        "fencing_token": mutex_fencing_token if current_holder != "Teacher" else None,
+        "lease_seconds": MUTEX_LEASE_SECONDS,
+        "lease_remaining_seconds": remaining
+    }
+
+def wake_mutex_lease_watcher():
+    if mutex_lease_wakeup is not None:
+        mutex_lease_wakeup.set()
+
+def grant_critical_section(student_id: str):
+    """Make `student_id` the holder with a new fencing token and a fresh lease; call with mutex_lock held"""
+    global current_holder, mutex_fencing_token, mutex_lease_deadline
+    current_holder = student_id
+    granted_students.add(student_id)
+    mutex_fencing_token += 1
+    mutex_lease_deadline = time.monotonic() + MUTEX_LEASE_SECONDS if MUTEX_LEASE_SECONDS > 0 else None
+    wake_mutex_waiter(student_id)
+    wake_mutex_lease_watcher()
+
+def pass_critical_section(student_id: str) -> Dict[str, Any]:
+    """Hand the CS from `student_id` to the earliest queued request, or back to the Teacher; call with mutex_lock held"""
+    global current_holder, mutex_lease_deadline
+    granted_students.discard(student_id)
+    if request_queue:
+        ts, next_student = request_queue.pop()
+        grant_critical_section(next_student)
+        return {
+            "status": "transferred",
+            "new_holder": next_student,
+            "timestamp": ts,
+            "fencing_token": mutex_fencing_token,
+            "message": f"Critical section transferred to {next_student}"
+        }
+    current_holder = "Teacher"
+    mutex_lease_deadline = None
+    return {
+        "status": "returned",
+        "holder": "Teacher",
+        "message": "Critical section returned to Teacher"
+    }
+
+def wake_mutex_waiter(student_id: str):
+    """Resolve the student's pending /mutex/wait long-polls; call after granting them the CS"""
+    for future in mutex_waiters.pop(student_id, ()):
+        if not future.done():
+            future.set_result(True)
+
+async def publish_mutex_event(event: str, student_id: str, change: Dict[str, Any]):
+    await broadcast_ws_event({
+        "type": "mutex",
+        "event": event,
+        "student_id": student_id,
+        "change": change
+    }, topics=("mutex",))
+
 @app.post("/api/v1/mutex/request")
 async def request_critical_section(mutex_req: MutualExclusionRequest):
     """Request access to critical section"""
-    global current_holder, granted_students
     with mutex_lock:
-        # Check if student is already in queue
-        student_in_queue = any(student == mutex_req.student_id for _, student in request_queue)
-        
-        if not student_in_queue:
-            heapq.heappush(request_queue, (mutex_req.timestamp, mutex_req.student_id))
+        # Queue the request unless the student is already waiting
+        pushed = request_queue.push(mutex_req.student_id, mutex_req.timestamp)
         
         if current_holder == "Teacher" and request_queue:
             # Grant immediately if teacher is current holder and queue has requests
-            ts, student = heapq.heappop(request_queue)
-            current_holder = student
-            granted_students.add(student)
-            return {
+            ts, student = request_queue.pop()
+            grant_critical_section(student)
+            result = {
                 "status": "granted",
                 "holder": student,
                 "timestamp": ts,
+                **mutex_lease_info(),
                 "message": f"Critical section granted to {student}"
             }
         else:
-            return {
+            result = {
                 "status": "queued",
                 "current_holder": current_holder,
-                "queue_position": len(request_queue),
+                "queue_position": request_queue.rank(mutex_req.student_id) + 1,
                 "message": f"Request queued for {mutex_req.student_id}"
             }
+        change = mutex_status_change(enqueued=mutex_req.student_id if pushed else None)
+    await publish_mutex_event(result["status"], result.get("holder", mutex_req.student_id), change)
+    return result
 
 class MutexReleaseRequest(BaseModel):
     student_id: str
+    fencing_token: Optional[int] = None  # token from the grant; a stale one is rejected
+
+class MutexLeaseRenewal(BaseModel):
+    student_id: str
+    fencing_token: int
+
+def check_fencing_token(student_id: str, fencing_token: Optional[int]):
+    """Reject a release/renewal from a holder whose lease already expired; call with mutex_lock held"""
+    if fencing_token is not None and (fencing_token != mutex_fencing_token or current_holder != student_id):
+        raise HTTPException(status_code=409, detail="Stale fencing token: the lease expired and the CS moved on")
 
 @app.post("/api/v1/mutex/release")
 async def release_critical_section(request: MutexReleaseRequest):
     """Release critical section"""
-    global current_holder, granted_students
     student_id = request.student_id
     with mutex_lock:
+        check_fencing_token(student_id, request.fencing_token)
         if current_holder != student_id:
             raise HTTPException(status_code=400, detail="Only current holder can release")
-        
-        # Remove from granted students
-        granted_students.discard(student_id)
-        
-        if request_queue:
-            ts, next_student = heapq.heappop(request_queue)
-            current_holder = next_student
-            granted_students.add(next_student)
-            return {
-                "status": "transferred",
-                "new_holder": next_student,
-                "timestamp": ts,
-                "message": f"Critical section transferred to {next_student}"
-            }
-        else:
-            current_holder = "Teacher"
-            return {
-                "status": "returned",
-                "holder": "Teacher",
-                "message": "Critical section returned to Teacher"
-            }
+        result = pass_critical_section(student_id)
+        change = mutex_status_change(removed=result.get("new_holder"))
+    await publish_mutex_event(result["status"], result.get("new_holder", "Teacher"), change)
+    return result
+
+@app.post("/api/v1/mutex/renew")
+async def renew_critical_section_lease(renewal: MutexLeaseRenewal):
+    """Heartbeat from the holder: restart its lease"""
+    global mutex_lease_deadline
+    with mutex_lock:
+        check_fencing_token(renewal.student_id, renewal.fencing_token)
+        if MUTEX_LEASE_SECONDS > 0:
+            mutex_lease_deadline = time.monotonic() + MUTEX_LEASE_SECONDS
+        wake_mutex_lease_watcher()
+        return {"status": "renewed", "holder": renewal.student_id, **mutex_lease_info()}
+
+async def mutex_lease_loop():
+    """Pass the CS on when the holder's lease runs out without a release or renewal"""
+    global mutex_lease_wakeup, mutex_leases_expired
+    mutex_lease_wakeup = asyncio.Event()
+    while True:
+        mutex_lease_wakeup.clear()
+        expired = None
+        with mutex_lock:
+            if mutex_lease_deadline is not None and time.monotonic() >= mutex_lease_deadline:
+                expired = current_holder
+                mutex_leases_expired += 1
+                result = pass_critical_section(expired)
+                change = mutex_status_change(removed=result.get("new_holder"))
+            deadline = mutex_lease_deadline
+        if expired is not None:
+            logger.warning(f"Mutex lease of {expired} expired; critical section {result['status']}")
+            await publish_mutex_event(result["status"], result.get("new_holder", "Teacher"), change)
+            continue
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            await asyncio.wait_for(mutex_lease_wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+@app.on_event("startup")
+async def start_mutex_leases():
+    global mutex_lease_task
+    mutex_lease_task = asyncio.create_task(mutex_lease_loop())
+
+class MutexCancelRequest(BaseModel):
+    student_id: str
+
+@app.post("/api/v1/mutex/cancel")
+async def cancel_critical_section_request(request: MutexCancelRequest):
+    """Withdraw a queued (not yet granted) critical section request"""
+    with mutex_lock:
+        if not request_queue.cancel(request.student_id):
+            raise HTTPException(status_code=404, detail="No queued request for this student")
+        result = {
+            "status": "cancelled",
+            "student_id": request.student_id,
+            "message": f"Request cancelled for {request.student_id}"
+        }
+        change = mutex_status_change(removed=request.student_id)
+    await publish_mutex_event(result["status"], request.student_id, change)
+    return result
+
+@app.post("/api/v1/mutex/reprioritize")
+async def reprioritize_critical_section_request(mutex_req: MutualExclusionRequest):
+    """Move a queued request to a new timestamp (e.g. the teacher bumping a student)"""
+    with mutex_lock:
+        if not request_queue.reprioritize(mutex_req.student_id, mutex_req.timestamp):
+            raise HTTPException(status_code=404, detail="No queued request for this student")
+        result = {
+            "status": "reprioritized",
+            "student_id": mutex_req.student_id,
+            "timestamp": mutex_req.timestamp,
+            "queue_position": request_queue.rank(mutex_req.student_id) + 1,
+            "message": f"Request for {mutex_req.student_id} moved to timestamp {mutex_req.timestamp}"
+        }
+        change = mutex_status_change(enqueued=mutex_req.student_id, removed=mutex_req.student_id)
+    await publish_mutex_event(result["status"], mutex_req.student_id, change)
+    return result
 
 @app.get("/api/v1/mutex/check/{student_id}")
 async def check_grant_status(student_id: str):
@@ -416,28 +1312,178 @@ async def check_grant_status(student_id: str):
             return {
                 "status": "granted",
                 "holder": student_id,
+                **mutex_lease_info(),
                 "message": f"Critical section access granted to {student_id}"
             }
         else:
+            rank = request_queue.rank(student_id)
             return {
                 "status": "not_granted",
                 "current_holder": current_holder,
+                "queue_position": rank + 1 if rank is not None else None,
                 "message": f"Critical section not granted to {student_id}"
             }
 
+@app.get("/api/v1/mutex/wait/{student_id}")
+async def wait_for_grant(student_id: str, timeout: float = 25):
+    """Long-poll: answer as soon as the student is granted the CS, or after `timeout` seconds.
+
+    The waiter parks on a future resolved by the grant, so handoff takes
+    milliseconds and idle waiters cost nothing. Responds like /mutex/check.
+    """
+    timeout = min(max(timeout, 0.0), MUTEX_WAIT_MAX_SECONDS)
+    with mutex_lock:
+        granted = student_id in granted_students and current_holder == student_id
+        if not granted:
+            future = asyncio.get_running_loop().create_future()
+            mutex_waiters.setdefault(student_id, []).append(future)
+    if not granted:
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters = mutex_waiters.get(student_id)
+            if waiters is not None and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del mutex_waiters[student_id]
+    return await check_grant_status(student_id)
+
 @app.get("/api/v1/mutex/status")
 async def get_mutex_status():
     """Get mutual exclusion status"""
     with mutex_lock:
-        return {
-            "current_holder": current_holder,
-            "queue": [{"student": student, "timestamp": ts} for ts, student in request_queue],
-            "queue_length": len(request_queue),
-            "granted_students": list(granted_students)
-        }
+        return mutex_status_snapshot()
 
 # ==================== TASK 6: EXAM PROCESSING ====================
 
+class TimingWheel:
+    """Hierarchical timing wheel for per-student exam deadlines.
+
+    Level 0 has one slot per tick; each higher level covers `slots` times the
+    span of the one below. Scheduling and cancelling are O(1), and each timer
+    is cascaded to a finer level at most `levels - 1` times, so advancing by a
+    tick costs O(1) amortized plus the timers that actually expire, however
+    many exams are running.
+    """
+
+    def __init__(self, start_tick: int, slots: int = 64, levels: int = 4):
+        self.slots = slots
+        self.levels = levels
+        self.current = start_tick
+        self.max_span = slots ** levels
+        self.wheels = [[{} for _ in range(slots)] for _ in range(levels)]  # slot: key -> expiry tick
+        self.where = {}  # key -> (level, slot)
+        self.overdue = []  # keys scheduled at or before the current tick
+
+    def __len__(self):
+        return len(self.where) + len(self.overdue)
+
+    def _place(self, key, expiry: int):
+        delta = expiry - self.current
+        if delta <= 0:
+            self.overdue.append(key)
+            return
+        # Timers beyond the top level's span park in its farthest slot and
+        # are re-placed when that slot cascades.
+        target = min(expiry, self.current + self.max_span - 1)
+        span = 1
+        for level in range(self.levels):
+            if target - self.current < span * self.slots:
+                slot = (target // span) % self.slots
+                self.wheels[level][slot][key] = expiry
+                self.where[key] = (level, slot)
+                return
+            span *= self.slots
+
+    def schedule(self, key, expiry: int):
+        """(Re)schedule `key` to expire at tick `expiry`"""
+        self.cancel(key)
+        self._place(key, expiry)
+
+    def cancel(self, key) -> bool:
+        position = self.where.pop(key, None)
+        if position is None:
+            if key in self.overdue:
+                self.overdue.remove(key)
+                return True
+            return False
+        level, slot = position
+        del self.wheels[level][slot][key]
+        return True
+
+    def advance(self, to_tick: int) -> List[Any]:
+        """Move the wheel forward to `to_tick` and return the keys that expired"""
+        expired, self.overdue = self.overdue, []
+        while self.current < to_tick:
+            self.current += 1
+            tick = self.current
+            span = self.slots
+            for level in range(1, self.levels):
+                if tick % span:
+                    break
+                bucket = self.wheels[level][(tick // span) % self.slots]
+                self.wheels[level][(tick // span) % self.slots] = {}
+                for key, expiry in bucket.items():
+                    del self.where[key]
+                    self._place(key, expiry)
+                span *= self.slots
+            slot = tick % self.slots
+            bucket = self.wheels[0][slot]
+            self.wheels[0][slot] = {}
+            for key in bucket:
+                del self.where[key]
+                expired.append(key)
+            expired.extend(self.overdue)
+            self.overdue = []
+        return expired
+
+exam_deadline_wheel = TimingWheel(start_tick=int(time.time()))
+
+def exam_allowed_seconds(student_id: str) -> int:
+    return EXAM_DURATION_SECONDS + exam_accommodations.get(student_id, 0)
+
+def finalize_exam(student_id: str, answers: List[str]) -> Dict[str, Any]:
+    """Grade and record a submission, and stop the student's deadline timer"""
+    correct_answers = sum(1 for i, q in enumerate(exam_questions)
+                if i < len(answers) and answers[i].upper() == q["ans"])
+    total_questions = len(exam_questions)
+    marks_percentage = round((correct_answers / total_questions) * 100) if total_questions > 0 else 0
+
+    exam_submissions[student_id] = {
+        "answers": answers,
+        "marks": marks_percentage,
+        "correct_answers": correct_answers,
+        "total_questions": total_questions,
+        "released": False
+    }
+    exam_status[student_id] = "Exam submitted"
+    exam_drafts.pop(student_id, None)
+    exam_deadlines.pop(student_id, None)
+    exam_deadline_wheel.cancel(student_id)
+    return exam_submissions[student_id]
+
+async def exam_deadline_loop():
+    """Advance the deadline wheel once per second and auto-submit expired exams"""
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+    while True:
+        for student_id in exam_deadline_wheel.advance(int(time.time())):
+            if student_id in exam_submissions:
+                continue
+            record = finalize_exam(student_id, exam_drafts.get(student_id, []))
+            logger.info(f"Exam deadline reached for {student_id}: auto-submitted with {record['marks']}%")
+            await publish_exam_status(student_id, auto_submitted=True)
+        next_tick += 1
+        await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+@app.on_event("startup")
+async def start_exam_deadlines():
+    global exam_deadline_task
+    exam_deadline_wheel.advance(int(time.time()))
+    exam_deadline_task = asyncio.create_task(exam_deadline_loop())
+
 @app.get("/api/v1/exam/questions")
 async def get_exam_questions():
     """Get exam questions"""
@@ -445,15 +1491,50 @@ async def get_exam_questions():
 
 @app.post("/api/v1/exam/start/{student_id}")
 async def start_exam(student_id: str):
-    """Start exam for a student"""
+    """Start exam for a student; the server auto-submits at the deadline"""
     exam_status[student_id] = "Exam started"
+    # A repeated start (page reload) resumes the running exam: only the first
+    # start sets the deadline, so re-POSTing can't extend it
+    if student_id not in exam_submissions and student_id not in exam_deadlines:
+        allowed_seconds = exam_allowed_seconds(student_id)
+        exam_deadlines[student_id] = time.time() + allowed_seconds
+        exam_deadline_wheel.schedule(student_id, int(exam_deadlines[student_id]))
+    deadline = exam_deadlines.get(student_id, time.time())
+    await publish_exam_status(student_id)
     return {
         "status": "started",
         "student_id": student_id,
         "questions": exam_questions,
+        "deadline_epoch": deadline,
+        "remaining_seconds": max(0, round(deadline - time.time())),
         "message": "Exam started successfully"
     }
 
+@app.put("/api/v1/exam/progress")
+async def save_exam_progress(submission: ExamSubmission):
+    """Save in-progress answers; they are submitted automatically at the deadline"""
+    student_id = submission.student_id
+    if student_id not in exam_deadlines:
+        raise HTTPException(status_code=400, detail="No exam in progress for this student")
+    exam_drafts[student_id] = submission.answers
+    return {"status": "saved", "student_id": student_id,
+            "remaining_seconds": max(0, round(exam_deadlines[student_id] - time.time()))}
+
+@app.post("/api/v1/exam/accommodation/{student_id}")
+async def set_exam_accommodation(student_id: str, extra_minutes: int = 0):
+    """Set extra exam time for a student, moving the deadline of an exam in progress"""
+    started = exam_deadlines[student_id] - exam_allowed_seconds(student_id) if student_id in exam_deadlines else None
+    exam_accommodations[student_id] = max(0, extra_minutes) * 60
+    if started is not None:
+        exam_deadlines[student_id] = started + exam_allowed_seconds(student_id)
+        exam_deadline_wheel.schedule(student_id, int(exam_deadlines[student_id]))
+    return {
+        "status": "updated",
+        "student_id": student_id,
+        "allowed_seconds": exam_allowed_seconds(student_id),
+        "deadline_epoch": exam_deadlines.get(student_id)
+    }
+
 @app.post("/api/v1/exam/submit")
 async def submit_exam(submission: ExamSubmission):
     """Submit exam answers"""
@@ -465,29 +1546,15 @@ async def submit_exam(submission: ExamSubmission):
             "message": "Exam already submitted"
         }
     
-    # Calculate marks
-    correct_answers = sum(1 for i, q in enumerate(exam_questions)
-                if i < len(submission.answers) and submission.answers[i].upper() == q["ans"])
-    
-    # Calculate percentage
-    total_questions = len(exam_questions)
-    marks_percentage = round((correct_answers / total_questions) * 100) if total_questions > 0 else 0
-    
-    exam_submissions[student_id] = {
-        "answers": submission.answers,
-        "marks": marks_percentage,
-        "correct_answers": correct_answers,
-        "total_questions": total_questions,
-        "released": False
-    }
-    exam_status[student_id] = "Exam submitted"
+    record = finalize_exam(student_id, submission.answers)
+    await publish_exam_status(student_id)
     
     return {
         "status": "submitted",
         "student_id": student_id,
-        "marks": marks_percentage,
-        "correct_answers": correct_answers,
-        "total_questions": total_questions,
+        "marks": record["marks"],
+        "correct_answers": record["correct_answers"],
+        "total_questions": record["total_questions"],
         "message": "Exam submitted successfully"
     }
 
@@ -499,6 +1566,7 @@ async def release_marks(student_id: str):
     
     exam_submissions[student_id]["released"] = True
     exam_status[student_id] = "Marks released"
+    await publish_exam_status(student_id)
     
     return {
         "status": "released",
@@ -507,35 +1575,37 @@ async def release_marks(student_id: str):
         "message": "Marks released successfully"
     }
 
-@app.get("/api/v1/exam/status/{student_id}")
-async def get_exam_status(student_id: str):
-    """Get exam status for a student"""
+def exam_status_view(student_id: str) -> Dict[str, Any]:
+    """Exam status as reported to the student (marks only once released)"""
     submission = exam_submissions.get(student_id)
     
     # Determine status based on submission state
     if submission:
         if submission["released"]:
-            status = "released"
-            result = {
+            return {
                 "student_id": student_id,
-                "status": status,
+                "status": "released",
                 "marks": submission["marks"]
             }
-        else:
-            status = "submitted"
-            result = {
-                "student_id": student_id,
-                "status": status
-            }
-    else:
-        # No submission found - check if exam was started
-        status = exam_status.get(student_id, "not_started")
-        result = {
+        return {
             "student_id": student_id,
-            "status": status
+            "status": "submitted"
         }
-    
-    return result
+    # No submission found - check if exam was started
+    return {
+        "student_id": student_id,
+        "status": exam_status.get(student_id, "not_started")
+    }
+
+async def publish_exam_status(student_id: str, **extra):
+    """Push a student's exam status change to them and to the proctor feed"""
+    await broadcast_ws_event({"type": "exam_status", **exam_status_view(student_id), **extra},
+                             topics=("proctor", f"exam:{student_id}"))
+
+@app.get("/api/v1/exam/status/{student_id}")
+async def get_exam_status(student_id: str):
+    """Get exam status for a student"""
+    return exam_status_view(student_id)
 
 @app.post("/api/v1/exam/reset/{student_id}")
 async def reset_exam(student_id: str):
@@ -548,7 +1618,13 @@ async def reset_exam(student_id: str):
     if student_id in exam_status:
         del exam_status[student_id]
     
+    # Stop any running deadline timer
+    exam_drafts.pop(student_id, None)
+    exam_deadlines.pop(student_id, None)
+    exam_deadline_wheel.cancel(student_id)
+    
     logger.info(f"Exam reset for student: {student_id}")
+    await publish_exam_status(student_id)
     
     return {
         "status": "reset",
@@ -577,6 +1653,7 @@ async def process_submission_local(student_id: str, payload: Dict[str, Any], wor
     if len(local_done) + len(backup_done) >= total_students:
         batch_processing = False
         logger.info("Batch processing completed")
+    await publish_load_balance_event("processed_local", student_id)
 
 async def process_submission_backup(student_id: str, payload: Dict[str, Any]):
     """Process submission on backup server"""
@@ -592,6 +1669,7 @@ async def process_submission_backup(student_id: str, payload: Dict[str, Any]):
         logger.info(f"✓ BACKUP SERVER → MAIN SERVER: Batch {batch_id} processed OK")
         logger.info(f"✓ MAIN SERVER: All submissions completed - Batch {batch_id} SUBMITTED")
         logger.info("Batch processing completed")
+    await publish_load_balance_event("processed_backup", student_id)
 
 @app.post("/api/v1/load-balance/submit")
 async def submit_for_load_balancing(submission: LoadBalanceSubmission, background_tasks: BackgroundTasks):
@@ -627,6 +1705,7 @@ async def submit_for_load_balancing(submission: LoadBalanceSubmission, backgroun
     if local_inflight >= migrate_threshold or not available_worker:
         # Migrate to backup
         background_tasks.add_task(process_submission_backup, student_id, payload)
+        await publish_load_balance_event("migrated", student_id)
         return {
             "status": "migrated",
             "student_id": student_id,
@@ -638,6 +1717,7 @@ async def submit_for_load_balancing(submission: LoadBalanceSubmission, backgroun
         # Process locally with assigned worker
         local_inflight += 1
         background_tasks.add_task(process_submission_local, student_id, payload, available_worker)
+        await publish_load_balance_event("accepted", student_id)
         return {
             "status": "accepted",
             "student_id": student_id,
@@ -647,9 +1727,8 @@ async def submit_for_load_balancing(submission: LoadBalanceSubmission, backgroun
             "message": "Submission accepted for local processing"
         }
 
-@app.get("/api/v1/load-balance/status")
-async def get_load_balance_status():
-    """Get enhanced load balancing status with batch processing"""
+def load_balance_snapshot() -> Dict[str, Any]:
+    """Enhanced load balancing status with batch processing"""
     batch_complete = len(local_done) + len(backup_done) >= total_students and batch_processing == False
     backup_response_sent = batch_complete and len(backup_done) > 0
     
@@ -671,6 +1750,19 @@ async def get_load_balance_status():
         "message": "Batch SUBMITTED - All processed" if batch_complete else "Processing..."
     }
 
+async def publish_load_balance_event(event: str, student_id: str):
+    await broadcast_ws_event({
+        "type": "load_balance",
+        "event": event,
+        "student_id": student_id,
+        "status": load_balance_snapshot()
+    }, topics=("load_balance",))
+
+@app.get("/api/v1/load-balance/status")
+async def get_load_balance_status():
+    """Get enhanced load balancing status with batch processing"""
+    return load_balance_snapshot()
+
 # ==================== TASK 8: DISTRIBUTED DATABASE ====================
 
 def find_chunk_for_record(roll_number: str):
@@ -891,9 +1983,10 @@ async def get_system_status():
             "distributed_database": "active"
         },
         "statistics": {
-            "total_students": len(students_names),
-            "violations_reported": sum(violations.values()),
-            "terminated_students": len(terminated_students),
+            "exam_sessions": len(exam_sessions),
+            "total_students": sum(len(session.roster) for session in exam_sessions.values()),
+            "violations_reported": sum(sum(session.roster.violations) for session in exam_sessions.values()),
+            "terminated_students": sum(sum(session.roster.terminated) for session in exam_sessions.values()),
             "exam_submissions": len(exam_submissions),
             "database_records": len(database)
         }
@@ -930,109 +2023,903 @@ async def get_api_documentation():
 
 # ==================== REAL-TIME SESSION (WEBSOCKET) ====================
 
-async def broadcast_ws_event(payload: Dict[str, Any]):
-    """Send an event to all connected WS clients"""
-    if not connected_clients:
-        return
-    dead = []
-    for ws in list(connected_clients):
+def encode_ws_message(text: str, encoding: str):
+    """Convert a serialized JSON event into a client's wire encoding"""
+    if encoding == "msgpack":
+        return msgpack.packb(json.loads(text))
+    return text
+
+def msgpack_array_header(n: int) -> bytes:
+    if n < 16:
+        return bytes([0x90 | n])
+    return b"\xdc" + n.to_bytes(2, "big")
+
+class WSClient:
+    """A /ws/session connection with its own bounded outbound queue.
+
+    A dedicated sender task drains the queue, so a slow or stalled browser
+    only ever delays its own messages, never a broadcast to everyone else.
+    Batching clients get every event queued within WS_BATCH_WINDOW_SECONDS
+    (up to WS_BATCH_MAX_EVENTS) as one array frame; msgpack clients get
+    binary frames.
+    """
+
+    def __init__(self, websocket: WebSocket, batch: bool = False, encoding: str = "json",
+                 session_id: str = DEFAULT_SESSION_ID):
+        self.websocket = websocket
+        self.session_id = session_id  # exam session whose topics this client names
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        self.sender_task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.topics: Optional[set] = None  # None = legacy client, receives all its room's events
+        self.batch = batch
+        self.encoding = encoding if encoding in WS_ENCODINGS else "json"
+
+    def start(self):
+        self.sender_task = asyncio.create_task(self._sender())
+
+    def enqueue(self, text: str) -> bool:
+        """Queue a serialized JSON event; False if the client is too slow"""
+        return self.enqueue_encoded(encode_ws_message(text, self.encoding))
+
+    def enqueue_encoded(self, message) -> bool:
+        """Queue an event already in this client's encoding"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _send(self, messages: list):
+        if self.encoding == "msgpack":
+            if self.batch:
+                await self.websocket.send_bytes(msgpack_array_header(len(messages)) + b"".join(messages))
+            else:
+                await self.websocket.send_bytes(messages[0])
+        elif self.batch:
+            await self.websocket.send_text("[" + ",".join(messages) + "]")
+        else:
+            await self.websocket.send_text(messages[0])
+
+    async def _sender(self):
         try:
-            await ws.send_json(payload)
+            while True:
+                messages = [await self.queue.get()]
+                if self.batch:
+                    if self.queue.qsize() < WS_BATCH_MAX_EVENTS - 1:
+                        await asyncio.sleep(WS_BATCH_WINDOW_SECONDS)  # let a burst accumulate
+                    while len(messages) < WS_BATCH_MAX_EVENTS and not self.queue.empty():
+                        messages.append(self.queue.get_nowait())
+                await self._send(messages)
+        except asyncio.CancelledError:
+            raise
         except Exception:
-            dead.append(ws)
-    for ws in dead:
+            # Socket is gone; the receive loop or the next broadcast cleans up
+            self.closed = True
+
+    async def close(self, code: int = 1000):
+        if self.closed and self.sender_task is None:
+            return
+        self.closed = True
+        if self.sender_task is not None:
+            self.sender_task.cancel()
+            self.sender_task = None
         try:
-            connected_clients.discard(ws)
-            await ws.close()
+            await asyncio.wait_for(self.websocket.close(code=code), timeout=WS_CLOSE_TIMEOUT)
         except Exception:
             pass
 
-async def session_tick_loop():
-    """Background ticker broadcasting remaining time once per second"""
-    global session_task, session_active
-    while session_active:
-        remaining = max(0, session_end_epoch - int(time.time()))
-        await broadcast_ws_event({
-            "type": "timer",
-            "active": session_active,
-            "remaining_seconds": remaining
-        })
-        if remaining <= 0:
-            session_active = False
-            await broadcast_ws_event({"type": "session_end"})
+class SSEClient(WSClient):
+    """Server-Sent Events fallback for clients that cannot hold a WebSocket.
+
+    Shares WSClient's bounded queue and topic routing; the streaming response
+    drains the queue instead of a sender task.
+    """
+
+    def __init__(self, session_id: str = DEFAULT_SESSION_ID):
+        super().__init__(websocket=None, session_id=session_id)
+
+    def start(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+def valid_ws_topic(topic: str) -> bool:
+    if topic in WS_TOPICS:
+        return True
+    prefix, _, key = topic.partition(":")
+    if prefix == "student":
+        return key.isdigit()
+    return prefix == "exam" and bool(key)
+
+def add_ws_client(client: WSClient, topics: Optional[Iterable[str]] = None):
+    connected_clients.add(client)
+    if topics is None and client.session_id != DEFAULT_SESSION_ID:
+        # Room clients never get the unfiltered stream of every room
+        topics = ["session", "proctor", "mutex", "load_balance"]
+    if topics is None:
+        ws_wildcard_clients.add(client)
+    else:
+        subscribe_ws_client(client, topics)
+
+def ws_topic_names(client: WSClient) -> Optional[List[str]]:
+    """A client's subscription as it named the topics (without its session prefix)"""
+    if client.topics is None:
+        return None
+    return sorted(topic.rpartition("/")[2] for topic in client.topics)
+
+def subscribe_ws_client(client: WSClient, topics: Iterable[str]) -> List[str]:
+    """Add topics to a client's subscription; the first call ends wildcard delivery"""
+    if client.topics is None:
+        client.topics = set()
+        ws_wildcard_clients.discard(client)
+    for topic in topics:
+        if valid_ws_topic(topic):
+            topic = scoped_topic(client.session_id, topic)
+            client.topics.add(topic)
+            ws_topic_index[topic].add(client)
+    return ws_topic_names(client)
+
+def unsubscribe_ws_client(client: WSClient, topics: Iterable[str]) -> List[str]:
+    if client.topics is None:
+        return []
+    for topic in topics:
+        topic = scoped_topic(client.session_id, topic)
+        client.topics.discard(topic)
+        subscribers = ws_topic_index.get(topic)
+        if subscribers is not None:
+            subscribers.discard(client)
+            if not subscribers:
+                del ws_topic_index[topic]
+    return ws_topic_names(client)
+
+def remove_ws_client(client: WSClient):
+    connected_clients.discard(client)
+    ws_wildcard_clients.discard(client)
+    for topic in client.topics or ():
+        subscribers = ws_topic_index.get(topic)
+        if subscribers is not None:
+            subscribers.discard(client)
+            if not subscribers:
+                del ws_topic_index[topic]
+
+def drop_ws_client(client: WSClient, code: int = 1000):
+    """Forget a client and close its socket in the background"""
+    remove_ws_client(client)
+    asyncio.create_task(client.close(code))
+
+def wildcard_visible(topics: Iterable[str]) -> bool:
+    """Whether unsubscribed clients see an event on these topics.
+
+    They only ever belong to the default room, whose topics keep bare names
+    like the shared `mutex`, `load_balance` and `exam:<id>`; another room's
+    topics carry its `<session_id>/` prefix and stay with that room.
+    """
+    return any("/" not in topic for topic in topics)
+
+def ws_recipients(topics: Optional[Iterable[str]]) -> set:
+    """Clients that should receive an event published on the given topics"""
+    if topics is None:
+        return set(connected_clients)
+    topics = tuple(topics)
+    recipients = set(ws_wildcard_clients) if wildcard_visible(topics) else set()
+    for topic in topics:
+        subscribers = ws_topic_index.get(topic)
+        if subscribers:
+            recipients |= subscribers
+    return recipients
+
+def ws_client_wants(client: WSClient, topics: Optional[tuple]) -> bool:
+    if topics is None:
+        return True
+    if client.topics is None:
+        return wildcard_visible(topics)
+    return not client.topics.isdisjoint(topics)
+
+def ws_snapshot(client: WSClient) -> Dict[str, Any]:
+    """Compact current state for a client whose resume point fell out of the replay buffer.
+
+    Besides the room's timer and students it carries the state behind each
+    other topic the client follows: `mutex`, `load_balance` and `exams`
+    (by student_id, for `exam:<id>` topics, or every exam for the default
+    room's proctors), shaped like the matching REST status responses.
+    """
+    session = exam_sessions.get(client.session_id) or ExamSession(client.session_id)
+    roster = session.roster
+    names = ws_topic_names(client)
+    if names is None or "proctor" in names:
+        rolls = list(roster.violation_counts())  # students without violations are implied
+    else:
+        rolls = [int(t.split(":", 1)[1]) for t in names if t.startswith("student:")]
+        rolls = [roll for roll in rolls if roll in roster]
+    snapshot = {
+        "type": "snapshot",
+        "seq": session.ws_seq,
+        "session_id": session.session_id,
+        "active": session.active,
+        "remaining_seconds": session_remaining_seconds(session),
+        "end_epoch": session.end_epoch,
+        "server_time": server_time_ms(),
+        "students": {roll: roster.student_state(roll) for roll in rolls}
+    }
+    if names is None or "mutex" in names:
+        with mutex_lock:
+            snapshot["mutex"] = mutex_status_snapshot()
+    if names is None or "load_balance" in names:
+        snapshot["load_balance"] = load_balance_snapshot()
+    if session.session_id == DEFAULT_SESSION_ID and (names is None or "proctor" in names):
+        exam_ids = set(exam_status) | set(exam_submissions)
+    else:
+        exam_ids = {t.split(":", 1)[1] for t in names or () if t.startswith("exam:")}
+    if exam_ids:
+        snapshot["exams"] = {student_id: exam_status_view(student_id) for student_id in sorted(exam_ids)}
+    return snapshot
+
+def resume_ws_client(client: WSClient, last_seq: int):
+    """Queue the events a reconnecting client missed in its session's stream, or a snapshot if the gap is too large"""
+    session = exam_sessions.get(client.session_id)
+    if session is None or last_seq >= session.ws_seq:
+        return
+    if last_seq < session.ws_replay_floor:
+        client.enqueue(json.dumps(ws_snapshot(client), separators=(",", ":")))
+        return
+    missed = [text for seq, topics, text in session.ws_replay
+              if seq > last_seq and ws_client_wants(client, topics)]
+    if len(missed) > WS_SEND_QUEUE_SIZE - client.queue.qsize():
+        # Replaying would overflow the send queue; a snapshot is smaller
+        client.enqueue(json.dumps(ws_snapshot(client), separators=(",", ":")))
+        return
+    for text in missed:
+        client.enqueue(text)
+
+def deliver_ws_event(seqs: Dict[str, int], topics: Optional[tuple], replay: bool, payload: Dict[str, Any]):
+    """Hand a numbered event to this process's WS clients.
+
+    `seqs` maps each session stream the event belongs to onto its seq in
+    that stream; only that session's clients get it, serialized once per
+    stream and encoding, not per client. Clients are never awaited, so
+    delivery latency does not depend on the slowest client. Clients whose
+    queue overflows (or whose sender died) are disconnected. Events with
+    `replay=False` (superseded ones such as timer ticks) are not kept for
+    resuming clients.
+    """
+    clients_by_session = defaultdict(list)
+    for client in ws_recipients(topics) if connected_clients else ():
+        clients_by_session[client.session_id].append(client)
+    slow = []
+    for session_id, seq in seqs.items():
+        session = exam_sessions.get(session_id)
+        clients = clients_by_session.get(session_id)
+        if session is None and not clients:
+            continue
+        text = json.dumps({**payload, "seq": seq}, separators=(",", ":"))
+        if session is not None:
+            session.ws_seq = seq
+            if replay:
+                if len(session.ws_replay) == session.ws_replay.maxlen:
+                    session.ws_replay_floor = session.ws_replay[0][0]
+                session.ws_replay.append((seq, topics, text))
+        encoded = {"json": text}
+        for client in clients or ():
+            message = encoded.get(client.encoding)
+            if message is None:
+                message = encoded[client.encoding] = encode_ws_message(text, client.encoding)
+            if not client.enqueue_encoded(message):
+                slow.append(client)
+    for client in slow:
+        logger.warning("Disconnecting slow WS client (send queue full)")
+        drop_ws_client(client, code=1013)
+
+def number_ws_event(seqs: Dict[str, int], envelope: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach each stream's seq (session_id -> seq) to a published envelope"""
+    return {"seqs": seqs, "topics": envelope["topics"], "replay": envelope["replay"], "payload": envelope["payload"]}
+
+def deliver_numbered_ws_event(event: Dict[str, Any]):
+    topics = tuple(event["topics"]) if event["topics"] is not None else None
+    deliver_ws_event(event["seqs"], topics, event["replay"], event["payload"])
+
+class LocalEventBus:
+    """Default bus: events only reach clients connected to this process"""
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, envelope: Dict[str, Any]):
+        seqs = {session_id: seq + 1 for session_id, seq in envelope["streams"].items()}
+        deliver_numbered_ws_event(number_ws_event(seqs, envelope))
+
+class SocketEventBus:
+    """Relays WS events between uvicorn workers over a Unix domain or loopback TCP socket.
+
+    The first worker to bind the address becomes the hub: it numbers every
+    event in each session stream it belongs to (so a session's `seq` is the
+    same on every worker and resumes work on any of them) and relays it to
+    every worker, itself included. Envelopes carry the publisher's current
+    seq per stream, so the hub learns rooms created on other workers and
+    never numbers below what a worker has already delivered. Only the hub
+    assigns seqs: events published while no hub is reachable are held (up
+    to WS_BUS_PENDING_LIMIT) and sent once the election settles. The others connect as peers, send
+    their events to the hub and re-run the election if the hub goes away.
+    Frames are newline-delimited JSON, like the task socket protocol.
+
+    A Unix socket path can be unlinked and rebound, so for `unix:` the hub
+    must also hold an exclusive flock on `<path>.lock` for as long as it
+    lives; only the lock holder ever removes the path. The kernel drops the
+    lock when the hub dies, which is what lets the next election proceed.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self.server = None
+        self.lock_fd: Optional[int] = None  # held hub lock (unix: hub only)
+        self.peers = set()  # StreamWriters of connected workers (hub only)
+        self.hub_writer = None  # connection to the hub (peer only)
+        self.pending = deque(maxlen=WS_BUS_PENDING_LIMIT)  # envelopes published mid-election
+        self.seqs: Dict[str, int] = {}  # session_id -> latest seq assigned (hub only)
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+        if self.server is not None:
+            self.server.close()
+            if self.lock_fd is not None:
+                try:
+                    os.unlink(self.address[len("unix:"):])  # ours: we still hold the lock
+                except OSError:
+                    pass
+        if self.lock_fd is not None:
+            os.close(self.lock_fd)  # releases the flock
+            self.lock_fd = None
+        for writer in list(self.peers) + ([self.hub_writer] if self.hub_writer else []):
+            writer.close()
+
+    async def _connect(self):
+        kind, _, target = self.address.partition(":")
+        if kind == "unix":
+            return await asyncio.open_unix_connection(target)
+        host, _, port = target.rpartition(":")
+        return await asyncio.open_connection(host, int(port))
+
+    def _acquire_hub_lock(self, target: str) -> bool:
+        """Try to take the exclusive, non-blocking flock that makes this worker the unix: hub"""
+        fd = os.open(target + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False  # a live hub holds it
+        self.lock_fd = fd
+        return True
+
+    async def _become_hub(self) -> bool:
+        kind, _, target = self.address.partition(":")
+        try:
+            if kind == "unix":
+                if fcntl is None:
+                    raise RuntimeError("EXAM_WS_BUS=unix: needs fcntl; use tcp: on this platform")
+                if not self._acquire_hub_lock(target):
+                    return False
+                # Holding the lock means no other worker is the hub, so whatever
+                # is at the path is a dead hub's socket and safe to replace
+                if os.path.exists(target):
+                    os.unlink(target)
+                self.server = await asyncio.start_unix_server(self._serve_peer, path=target)
+            else:
+                host, _, port = target.rpartition(":")
+                self.server = await asyncio.start_server(self._serve_peer, host, int(port))
+        except OSError:
+            if self.lock_fd is not None:
+                os.close(self.lock_fd)
+                self.lock_fd = None
+            return False  # another worker won the election
+        self.seqs = {session_id: session.ws_seq for session_id, session in exam_sessions.items()}
+        logger.info(f"WS event bus hub listening on {self.address} (pid {os.getpid()})")
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                reader, writer = await self._connect()
+            except OSError:
+                if await self._become_hub():
+                    while self.pending:
+                        self._route(self.pending.popleft())
+                    return
+                await asyncio.sleep(WS_BUS_RETRY_SECONDS * random.random())
+                continue
+            self.hub_writer = writer
+            logger.info(f"WS event bus connected to hub at {self.address} (pid {os.getpid()})")
+            try:
+                while self.pending:
+                    writer.write(self._encode(self.pending.popleft()))
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    deliver_numbered_ws_event(json.loads(line))
+            except (ConnectionError, json.JSONDecodeError):
+                pass
+            finally:
+                self.hub_writer = None
+                writer.close()
+            logger.warning("WS event bus lost the hub, re-electing")
+            await asyncio.sleep(WS_BUS_RETRY_SECONDS * random.random())
+
+    async def _serve_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.peers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._route(json.loads(line))
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            self.peers.discard(writer)
+            writer.close()
+
+    def _route(self, envelope: Dict[str, Any]):
+        for session_id, seq in envelope["streams"].items():
+            self.seqs[session_id] = max(self.seqs.get(session_id, 0), seq)
+        # A room's own events go to its stream; shared ones to every room the hub knows
+        streams = envelope["streams"] if envelope["session_id"] is not None else self.seqs
+        seqs = {}
+        for session_id in streams:
+            seqs[session_id] = self.seqs[session_id] = self.seqs[session_id] + 1
+        event = number_ws_event(seqs, envelope)
+        line = (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+        for writer in list(self.peers):
+            if writer.transport.get_write_buffer_size() > WS_BUS_PEER_BUFFER_LIMIT:
+                logger.warning("Dropping lagging WS event bus peer")
+                self.peers.discard(writer)
+                writer.close()
+                continue
+            writer.write(line)
+        deliver_numbered_ws_event(event)
+
+    @staticmethod
+    def _encode(envelope: Dict[str, Any]) -> bytes:
+        return (json.dumps(envelope, separators=(",", ":")) + "\n").encode("utf-8")
+
+    async def publish(self, envelope: Dict[str, Any]):
+        if self.server is not None:
+            self._route(envelope)
+            return
+        writer = self.hub_writer
+        if writer is None:
+            # Mid-election: only the hub numbers events, so hold it until there is one
+            if len(self.pending) == self.pending.maxlen:
+                logger.warning("WS event bus election backlog full, dropping the oldest event")
+            self.pending.append(envelope)
+            return
+        writer.write(self._encode(envelope))
+        try:
+            await asyncio.wait_for(writer.drain(), WS_BUS_DRAIN_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError):
+            # Closing makes _run() see the hub as gone and re-elect; until then
+            # further events wait in `pending`
+            logger.warning("WS event bus hub is not keeping up, reconnecting")
+            if self.hub_writer is writer:
+                self.hub_writer = None
+            writer.close()
+
+def create_event_bus(address: str):
+    if address == "local":
+        return LocalEventBus()
+    if address.startswith("unix:") or address.startswith("tcp:"):
+        return SocketEventBus(address)
+    raise ValueError(f"Unsupported EXAM_WS_BUS address: {address}")
+
+async def broadcast_ws_event(payload: Dict[str, Any], topics: Optional[Iterable[str]] = None,
+                             replay: bool = True, session_id: Optional[str] = None):
+    """Publish an event to the WS clients subscribed to any of `topics`, on every worker.
+
+    `topics=None` addresses every connected client. An event of one exam
+    session (`session_id`) is numbered in that session's stream only; shared
+    events (mutex, load balancing, exams) in every session's. See
+    deliver_ws_event() for how each worker fans the event out to its own
+    clients.
+    """
+    if session_id is not None:
+        session = exam_sessions.get(session_id)
+        streams = {session_id: session.ws_seq if session is not None else 0}
+    else:
+        streams = {sid: session.ws_seq for sid, session in exam_sessions.items()}
+    envelope = {"topics": list(topics) if topics is not None else None, "replay": replay, "payload": payload,
+                "session_id": session_id, "streams": streams}
+    await (ws_event_bus or LocalEventBus()).publish(envelope)
+
+@app.on_event("startup")
+async def start_event_bus():
+    global ws_event_bus
+    ws_event_bus = create_event_bus(WS_BUS_ADDRESS)
+    await ws_event_bus.start()
+
+@app.on_event("shutdown")
+async def stop_event_bus():
+    if ws_event_bus is not None:
+        await ws_event_bus.stop()
+
+def server_time_ms() -> int:
+    """Wall-clock time sent with timer events so clients can measure their offset"""
+    return int(time.time() * 1000)
+
+def session_remaining_seconds(session: ExamSession) -> int:
+    if not session.active:
+        return 0
+    return max(0, round(session.end_monotonic - asyncio.get_running_loop().time()))
+
+def wake_session_timer(session: ExamSession):
+    if session.wakeup is None:
+        session.wakeup = asyncio.Event()
+    session.wakeup.set()
+
+def set_session_deadline(session: ExamSession, seconds_from_now: float):
+    """Set the session end on both the wall clock (for clients) and the monotonic clock (for the loop)"""
+    now = time.time()
+    session.end_epoch = int(now + seconds_from_now)
+    session.end_monotonic = asyncio.get_running_loop().time() + (session.end_epoch - now)
+    wake_session_timer(session)
+
+async def session_tick_loop(session: ExamSession):
+    """Per-session task sending periodic `timer` resyncs and `session_end` at the deadline.
+
+    Clients count down locally from `end_epoch`, so the server only resyncs
+    every SESSION_RESYNC_SECONDS. Wake-ups are scheduled against the
+    event-loop (monotonic) clock, so they don't drift with broadcast time
+    or wall-clock adjustments.
+    """
+    loop = asyncio.get_running_loop()
+    topics = session.topics("session")
+    next_resync = loop.time() + SESSION_RESYNC_SECONDS
+    while session.active:
+        now = loop.time()
+        if now >= session.end_monotonic:
+            session.active = False
+            await broadcast_ws_event({"type": "session_end", "session_id": session.session_id,
+                                      "server_time": server_time_ms()}, topics=topics, session_id=session.session_id)
             break
-        await asyncio.sleep(1)
-    session_task = None
+        if now >= next_resync:
+            await broadcast_ws_event({
+                "type": "timer",
+                "session_id": session.session_id,
+                "active": session.active,
+                "remaining_seconds": session_remaining_seconds(session),
+                "end_epoch": session.end_epoch,
+                "server_time": server_time_ms()
+            }, topics=topics, replay=False, session_id=session.session_id)
+            while next_resync <= now:
+                next_resync += SESSION_RESYNC_SECONDS
+        session.wakeup.clear()
+        try:
+            await asyncio.wait_for(session.wakeup.wait(),
+                                   timeout=max(0.0, min(next_resync, session.end_monotonic) - loop.time()))
+        except asyncio.TimeoutError:
+            pass
+    session.task = None
 
 @app.post("/api/v1/session/start")
-async def start_session(duration_minutes: int = 60):
-    """Start an exam session and broadcast timer via WS"""
-    global session_active, session_duration_seconds, session_end_epoch, session_task
-    session_duration_seconds = max(1, duration_minutes) * 60
-    session_end_epoch = int(time.time()) + session_duration_seconds
-    session_active = True
-    if session_task is None:
-        session_task = asyncio.create_task(session_tick_loop())
+async def start_session(duration_minutes: int = 60, session_id: str = DEFAULT_SESSION_ID):
+    """Start an exam session; clients count down from the broadcast end_epoch"""
+    session = get_exam_session(session_id)
+    session.duration_seconds = max(1, duration_minutes) * 60
+    session.active = True
+    set_session_deadline(session, session.duration_seconds)
+    if session.task is None:
+        session.task = asyncio.create_task(session_tick_loop(session))
     await broadcast_ws_event({
         "type": "session_start",
-        "duration_seconds": session_duration_seconds,
-        "end_epoch": session_end_epoch
-    })
-    return {"status": "started", "duration_seconds": session_duration_seconds, "end_epoch": session_end_epoch}
+        "session_id": session_id,
+        "duration_seconds": session.duration_seconds,
+        "end_epoch": session.end_epoch,
+        "server_time": server_time_ms()
+    }, topics=session.topics("session"), session_id=session_id)
+    return {"status": "started", "session_id": session_id, "duration_seconds": session.duration_seconds,
+            "end_epoch": session.end_epoch}
+
+@app.post("/api/v1/session/extend")
+async def extend_session(minutes: int = 5, session_id: str = DEFAULT_SESSION_ID):
+    """Extend the active session; clients move their local countdown to the new end_epoch"""
+    session = get_exam_session(session_id)
+    if not session.active:
+        raise HTTPException(status_code=400, detail="No active session")
+    added_seconds = max(1, minutes) * 60
+    session.duration_seconds += added_seconds
+    set_session_deadline(session, session.end_monotonic - asyncio.get_running_loop().time() + added_seconds)
+    await broadcast_ws_event({
+        "type": "session_extend",
+        "session_id": session_id,
+        "added_seconds": added_seconds,
+        "end_epoch": session.end_epoch,
+        "server_time": server_time_ms()
+    }, topics=session.topics("session"), session_id=session_id)
+    return {"status": "extended", "session_id": session_id, "added_seconds": added_seconds,
+            "end_epoch": session.end_epoch}
 
 @app.post("/api/v1/session/stop")
-async def stop_session():
+async def stop_session(session_id: str = DEFAULT_SESSION_ID):
     """Stop an active session"""
-    global session_active
-    session_active = False
-    await broadcast_ws_event({"type": "session_stop"})
-    return {"status": "stopped"}
+    session = get_exam_session(session_id)
+    session.active = False
+    wake_session_timer(session)
+    await broadcast_ws_event({"type": "session_stop", "session_id": session_id, "server_time": server_time_ms()},
+                             topics=session.topics("session"), session_id=session_id)
+    return {"status": "stopped", "session_id": session_id}
 
 @app.post("/api/v1/session/reset")
-async def reset_session_state():
+async def reset_session_state(session_id: str = DEFAULT_SESSION_ID):
     """Reset counters/state relevant for a fresh run (non-destructive demo reset)"""
-    global violations, terminated_students, marksheet, violation_counters
-    violations = {}
-    terminated_students = set()
-    marksheet = dict.fromkeys(students_names, 100)
-    violation_counters = dict.fromkeys(students_names, 0)
-    await broadcast_ws_event({"type": "reset"})
-    return {"status": "reset"}
+    session = get_exam_session(session_id)
+    session.reset()
+    await broadcast_ws_event({"type": "reset", "session_id": session_id},
+                             topics=session.topics("session", "proctor"), session_id=session_id)
+    return {"status": "reset", "session_id": session_id}
 
 @app.get("/api/v1/session/status")
-async def get_session_status():
-    remaining = max(0, session_end_epoch - int(time.time())) if session_active else 0
+async def get_session_status(session_id: str = DEFAULT_SESSION_ID):
+    session = get_exam_session(session_id)
     return {
-        "active": session_active,
-        "remaining_seconds": remaining,
-        "end_epoch": session_end_epoch,
-        "connected_clients": len(connected_clients)
+        "session_id": session_id,
+        "active": session.active,
+        "remaining_seconds": session_remaining_seconds(session),
+        "end_epoch": session.end_epoch,
+        "server_time": server_time_ms(),
+        "connected_clients": len(connected_clients),
+        "topic_subscribers": {topic: len(clients) for topic, clients in ws_topic_index.items()}
     }
 
+@app.post("/api/v1/sessions/{session_id}")
+async def create_exam_session(session_id: str, roster_import: Optional[RosterImport] = None):
+    """Create an exam session (room) with its own roster, timer and WS topics"""
+    if not SESSION_ID_PATTERN.match(session_id):
+        raise HTTPException(status_code=400, detail="Session ID must be 1-64 letters, digits, '_' or '-'")
+    if session_id in exam_sessions:
+        raise HTTPException(status_code=409, detail="Session already exists")
+    students = [(student.roll, student.name) for student in roster_import.students] if roster_import else []
+    if len(students) > MAX_ROSTER_IMPORT:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_ROSTER_IMPORT} students per import")
+    session = exam_sessions[session_id] = ExamSession(session_id, students)
+    logger.info(f"Created exam session {session_id} with {len(session.roster)} students")
+    # Opens the room's event stream (and registers it with the event bus hub)
+    await broadcast_ws_event({"type": "session_created", "session_id": session_id,
+                              "total_students": len(session.roster)},
+                             topics=session.topics("session"), session_id=session_id)
+    return {"status": "created", "session_id": session_id, "total_students": len(session.roster)}
+
+@app.get("/api/v1/sessions")
+async def list_exam_sessions():
+    return {
+        "sessions": [
+            {
+                "session_id": session.session_id,
+                "active": session.active,
+                "remaining_seconds": session_remaining_seconds(session),
+                "total_students": len(session.roster),
+                "violations_logged": len(session.violation_log)
+            }
+            for session in exam_sessions.values()
+        ]
+    }
+
+@app.delete("/api/v1/sessions/{session_id}")
+async def delete_exam_session(session_id: str):
+    """Stop and discard a session's state (the default session cannot be deleted)"""
+    if session_id == DEFAULT_SESSION_ID:
+        raise HTTPException(status_code=400, detail="The default session cannot be deleted")
+    session = get_exam_session(session_id)
+    # Announce first, while the room's stream still numbers it
+    await broadcast_ws_event({"type": "session_deleted", "session_id": session_id},
+                             topics=session.topics("session", "proctor"), session_id=session_id)
+    del exam_sessions[session_id]
+    session.active = False
+    if session.task is not None:
+        wake_session_timer(session)
+    return {"status": "deleted", "session_id": session_id}
+
+def ws_hello(client: WSClient) -> str:
+    """Initial state sent to every new stream client"""
+    session = exam_sessions.get(client.session_id) or ExamSession(client.session_id)
+    return json.dumps({
+        "type": "hello",
+        "seq": session.ws_seq,
+        "session_id": session.session_id,
+        "active": session.active,
+        "remaining_seconds": session_remaining_seconds(session),
+        "end_epoch": session.end_epoch,
+        "server_time": server_time_ms(),
+        "topics": ws_topic_names(client),
+        "batch": client.batch,
+        "encoding": client.encoding
+    }, separators=(",", ":"))
+
+def parse_topics_param(topics: Optional[str]) -> Optional[List[str]]:
+    """`?topics=a,b` -> ["a", "b"]; no parameter means every event of the client's room"""
+    return [t for t in topics.split(",") if t] if topics else None
+
 @app.websocket("/ws/session")
-async def session_ws(websocket: WebSocket):
+async def session_ws(websocket: WebSocket, topics: Optional[str] = None, last_seq: Optional[int] = None,
+                     batch: bool = False, encoding: str = "json", session_id: str = DEFAULT_SESSION_ID):
+    """Session event stream.
+
+    Clients may pass `?topics=session,student:58` or send
+    `{"type": "subscribe"|"unsubscribe", "topics": [...]}` at any time to
+    receive only the events they need; clients that never subscribe get
+    every event of their room (plus the shared `mutex`, `load_balance`
+    and `exam:<id>` topics for the default room). Every event carries a `seq`; reconnecting with
+    `?last_seq=<seq>` replays the missed events (or sends a `snapshot` if
+    they are no longer buffered) before live delivery resumes.
+    `?batch=1` packs events into array frames and `?encoding=msgpack`
+    (when msgpack is installed) switches to binary frames.
+    `?session_id=` selects the exam room whose `session`, `proctor` and
+    `student:<roll>` topics the client sees.
+    """
     await websocket.accept()
-    connected_clients.add(websocket)
+    if session_id not in exam_sessions:
+        await websocket.close(code=1008)
+        return
+    client = WSClient(websocket, batch=batch, encoding=encoding, session_id=session_id)
+    client.start()
+    # No awaits between here and add_ws_client(): hello and the replay are
+    # queued before any live event, so the stream stays gap-free and ordered.
+    add_ws_client(client, parse_topics_param(topics))
     try:
-        # Send initial state
-        await websocket.send_json({
-            "type": "hello",
-            "active": session_active,
-            "remaining_seconds": max(0, session_end_epoch - int(time.time())) if session_active else 0
-        })
+        client.enqueue(ws_hello(client))
+        if last_seq is not None:
+            resume_ws_client(client, last_seq)
         while True:
-            # Keep the connection alive; ignore incoming messages
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            requested = message.get("topics") or []
+            if not isinstance(requested, list):
+                continue
+            requested = [t for t in requested if isinstance(t, str)]
+            if message.get("type") == "subscribe":
+                current = subscribe_ws_client(client, requested)
+            elif message.get("type") == "unsubscribe":
+                current = unsubscribe_ws_client(client, requested)
+            else:
+                continue
+            client.enqueue(json.dumps({"type": "subscribed", "topics": current}, separators=(",", ":")))
     except WebSocketDisconnect:
         pass
     except Exception:
         pass
     finally:
+        remove_ws_client(client)
+        await client.close()
+
+def apply_telemetry_frame(session: ExamSession, signals: list, now: float) -> List[Dict[str, Any]]:
+    """Feed `[roll, kind]` / `[roll, kind, question_no]` signals to the session's windows.
+
+    Returns the violation events decided by the frame. Malformed signals
+    and unknown rolls are skipped.
+    """
+    roster, telemetry = session.roster, session.telemetry
+    events = []
+    for signal in signals:
+        if not isinstance(signal, list) or len(signal) < 2:
+            telemetry.rejected += 1
+            continue
+        roll, kind = signal[0], signal[1]
+        if not isinstance(roll, int) or roll not in roster.index or not isinstance(kind, str):
+            telemetry.rejected += 1
+            continue
+        if not telemetry.observe(roll, kind, now):
+            continue
+        question_no = signal[2] if len(signal) > 2 and isinstance(signal[2], int) else 0
+        if not 0 <= question_no < INT32_LIMIT:
+            question_no = 0
+        threshold, window = TELEMETRY_RULES[kind]
+        result = apply_violation(session, ViolationReport(
+            roll=roll,
+            name=roster.name(roll),
+            warning=f"{kind.replace('_', ' ')} x{threshold} within {window:g}s",
+            question_no=question_no,
+            violation_no=roster.violations[roster.index[roll]] + 1
+        ))
+        event = result.pop("event", None)
+        if event is not None:
+            events.append(event)
+    return events
+
+@app.websocket("/ws/telemetry")
+async def telemetry_ws(websocket: WebSocket, session_id: str = DEFAULT_SESSION_ID):
+    """Raw proctoring signals from browsers (or a per-room relay).
+
+    Each text (JSON) or binary (msgpack) frame is an array of
+    `[roll, kind, question_no?]` signals with kind one of TELEMETRY_RULES.
+    Signals are timestamped on arrival and counted in per-student sliding
+    windows; a threshold crossing becomes a violation, applied and broadcast
+    exactly like /violation/report-batch. Nothing is sent back per frame.
+    """
+    await websocket.accept()
+    session = exam_sessions.get(session_id)
+    if session is None:
+        await websocket.close(code=1008)
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            try:
+                if message.get("bytes") is not None:
+                    if msgpack is None:
+                        continue
+                    signals = msgpack.unpackb(message["bytes"])
+                else:
+                    signals = json.loads(message.get("text") or "null")
+            except Exception:
+                continue
+            if not isinstance(signals, list) or len(signals) > MAX_TELEMETRY_FRAME:
+                session.telemetry.rejected += 1
+                continue
+            events = apply_telemetry_frame(session, signals, loop.time())
+            await publish_violation_batch(session, events)
+    except WebSocketDisconnect:
+        pass
+
+@app.get("/api/v1/telemetry/stats")
+async def get_telemetry_stats(session_id: str = DEFAULT_SESSION_ID):
+    """Telemetry counters and the rules used to turn signals into violations"""
+    telemetry = get_exam_session(session_id).telemetry
+    return {
+        "session_id": session_id,
+        "signals": telemetry.signals,
+        "rejected": telemetry.rejected,
+        "violations_decided": telemetry.decisions,
+        "tracked_windows": len(telemetry.windows),
+        "rules": {kind: {"threshold": threshold, "window_seconds": window}
+                  for kind, (threshold, window) in TELEMETRY_RULES.items()}
+    }
+
+SSE_KEEPALIVE_SECONDS = 15
+
+@app.get("/api/v1/events")
+async def session_events_sse(request: Request, topics: Optional[str] = None, last_seq: Optional[int] = None,
+                             session_id: str = DEFAULT_SESSION_ID):
+    """Server-Sent Events fallback for /ws/session with the same topics, seq and resume semantics"""
+    get_exam_session(session_id)
+    client = SSEClient(session_id=session_id)
+    add_ws_client(client, parse_topics_param(topics))
+    client.enqueue(ws_hello(client))
+    if last_seq is not None:
+        resume_ws_client(client, last_seq)
+
+    async def stream():
         try:
-            connected_clients.discard(websocket)
-        except Exception:
-            pass
+            while not client.closed:
+                try:
+                    text = await asyncio.wait_for(client.queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {text}\n\n"
+        finally:
+            remove_ws_client(client)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE)
@@ -121,7 +121,7 @@ def test_task_1_3_violation_detection():
         else:
             print_error(f"Failed to get marksheet: {response.status_code}")
             return False
-        
+
         print_success("\n✓ Task 1-3: All tests passed!")
         return True
         
@@ -129,6 +129,63 @@ def test_task_1_3_violation_detection():
         print_error(f"Exception during testing: {e}")
         return False
 
+def test_violation_batch():
+    """Test Task 1-3: Batch Violation Reporting"""
+    print_header("Task 1-3: Batch Violation Reporting")
+
+    try:
+        # Start from a clean session so earlier runs cannot change the outcomes
+        requests.post(f"{API_BASE}/session/reset").raise_for_status()
+
+        # Test 1: Batch report (warning, termination and an unknown roll in one request)
+        print_info("Test 1: Reporting a batch of violations")
+        batch = {"violations": [
+            {"roll": 59, "name": "Saish", "warning": "Tab switch", "question_no": 3, "violation_no": 1},
+            {"roll": 59, "name": "Saish", "warning": "Tab switch", "question_no": 4, "violation_no": 2},
+            {"roll": 999, "name": "Unknown", "warning": "Tab switch", "question_no": 4, "violation_no": 1}
+        ]}
+        response = requests.post(f"{API_BASE}/violation/report-batch", json=batch)
+        if response.status_code == 200:
+            statuses = [r["status"] for r in response.json()["results"]]
+            if statuses != ["warning", "terminated", "error"]:
+                print_error(f"Unexpected batch results: {statuses}")
+                return False
+            print_success(f"Batch processed in order: {statuses}")
+        else:
+            print_error(f"Failed to report batch: {response.status_code}")
+            return False
+
+        print_success("\n✓ Batch Violation Reporting: All tests passed!")
+        return True
+
+    except Exception as e:
+        print_error(f"Exception during testing: {e}")
+        return False
+
+def test_violation_dedup():
+    """Test Task 1-3: Duplicate Violation Collapsing"""
+    print_header("Task 1-3: Duplicate Violation Collapsing")
+
+    try:
+        # Start from a clean session so the first report is never already a duplicate
+        requests.post(f"{API_BASE}/session/reset").raise_for_status()
+
+        # Test 1: A flapping signal (same roll, question and warning) only counts once
+        print_info("Test 1: Reporting the same violation twice in a row")
+        flapping = {"roll": 65, "name": "Khushal", "warning": "Webcam lost", "question_no": 7, "violation_no": 1}
+        statuses = [requests.post(f"{API_BASE}/violation/report", json=flapping).json()["status"] for _ in range(2)]
+        if statuses != ["warning", "duplicate"]:
+            print_error(f"Duplicate was not collapsed: {statuses}")
+            return False
+        print_success(f"Duplicate collapsed: {statuses}")
+
+        print_success("\n✓ Duplicate Violation Collapsing: All tests passed!")
+        return True
+
+    except Exception as e:
+        print_error(f"Exception during testing: {e}")
+        return False
+
 def test_task_4_clock_sync():
     """Test Task 4: Berkeley Clock Synchronization"""
     print_header("Task 4: Berkeley Clock Synchronization")
@@ -472,6 +529,12 @@ def main():
     # Run all tests
     results["Task 1-3: Violation Detection"] = test_task_1_3_violation_detection()
     time.sleep(2)
+
+    results["Task 1-3: Batch Violation Reporting"] = test_violation_batch()
+    time.sleep(2)
+
+    results["Task 1-3: Duplicate Violation Collapsing"] = test_violation_dedup()
+    time.sleep(2)
     
     results["Task 4: Clock Synchronization"] = test_task_4_clock_sync()
     time.sleep(2)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the socket helpers in utils.py (no server needed)
+"""
+
+import gc
+import socket
+
+import utils
+
+
+def test_readers_are_freed_with_their_sockets():
+    before = len(utils._readers)
+    pairs = [socket.socketpair() for _ in range(50)]
+    for a, b in pairs:
+        utils.send_json(a, {"n": 1})
+        assert utils.recv_json(b) == {"n": 1}
+    assert len(utils._readers) == before + 50
+    for a, b in pairs:
+        a.close()
+        b.close()
+    del pairs, a, b
+    gc.collect()
+    assert len(utils._readers) == before
+
+
+def test_reader_is_dropped_at_eof():
+    a, b = socket.socketpair()
+    utils.send_json(a, {"n": 1})
+    a.close()
+    assert utils.recv_json(b) == {"n": 1}
+    assert b in utils._readers
+    assert utils.recv_json(b) is None
+    assert b not in utils._readers
+    b.close()
+
+
+if __name__ == "__main__":
+    for test in (test_readers_are_freed_with_their_sockets, test_reader_is_dropped_at_eof):
+        test()
+        print(f"✓ {test.__name__}")
@@ -1,39 +1,583 @@
 # utils.py
+import asyncio
 import json
+import os
+import random
+import select
 import socket
+import struct
+import threading
+import time
+import weakref
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON codec
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: compact binary codec
+    msgpack = None
+
+# ---- Codecs for length-prefixed framing ----
+# Newline-delimited JSON is the default wire format. Peers may negotiate
+# length-prefixed frames instead: a 4-byte big-endian payload length and a
+# 1-byte codec ID, then the encoded message.
+
+def _json_encode(data) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+CODECS = {"json": (1, _json_encode, json.loads)}  # name -> (id, encode, decode)
+if orjson is not None:
+    CODECS["orjson"] = (2, orjson.dumps, orjson.loads)
+if msgpack is not None:
+    # Unlike JSON, msgpack keeps integer dict keys as integers
+    CODECS["msgpack"] = (3, msgpack.packb, lambda payload: msgpack.unpackb(payload, strict_map_key=False))
+CODECS_BY_ID = {codec_id: (name, encode, decode) for name, (codec_id, encode, decode) in CODECS.items()}
+
+FRAME_HEADER = struct.Struct("!IB")  # payload length, codec ID
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+# Negotiation lines start with NUL, so they are never valid JSON: a peer that
+# only speaks newline JSON skips the offer and the connection stays on JSON
+FRAMING_PREFIX = b"\x00FRAMING "
+FRAMING_TIMEOUT = 2.0
+# Codecs a connecting peer offers, in preference order (unset: no offer, newline JSON)
+OFFERED_CODECS = [c for c in os.environ.get("EXAM_SOCKET_CODECS", "").split(",") if c]
 
 def send_json(sock: socket.socket, data: dict):
     """
-    Send a JSON-serializable object over TCP with '\n' delimiter.
+    Send a JSON-serializable object over TCP with '\n' delimiter, or as a
+    length-prefixed frame if the connection negotiated framing.
     """
-    msg = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    reader = _readers.get(sock)
+    codec = reader.codec if reader is not None else None
+    if codec is None:
+        msg = _json_encode(data) + b"\n"
+    else:
+        codec_id, encode, _ = CODECS[codec]
+        payload = encode(data)
+        msg = FRAME_HEADER.pack(len(payload), codec_id) + payload
     try:
-        sock.sendall(msg + b"\n")
+        sock.sendall(msg)
     except Exception as e:
         # Caller handles closed sockets
         raise
 
+class JsonLineReader:
+    """
+    Buffered reader for one socket's '\n'-delimited JSON messages (or its
+    length-prefixed frames once `codec` is set by negotiation).
+    Bytes are received straight into a reusable bytearray (recv_into), and
+    everything after a message stays buffered for the next call, so several
+    messages arriving in one recv() are all delivered. Newlines are searched
+    only in newly received bytes and the buffer grows by doubling, so long
+    or many messages cost linear time.
+    The reader only holds a weak reference to its socket, so the
+    socket -> reader registry never keeps either of them alive.
+    """
+    def __init__(self, sock: socket.socket, bufsize: int = 65536):
+        self._sock = weakref.ref(sock)
+        self.buffer = bytearray(bufsize)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # first byte not yet returned
+        self.end = 0    # end of received data
+        self.scan = 0   # bytes before this offset contain no newline
+        self.codec = None  # negotiated frame codec name; None = newline JSON
+        self.broken = False  # framing lost: every later read reports a closed socket
+
+    @property
+    def sock(self) -> socket.socket:
+        sock = self._sock()
+        if sock is None:
+            raise OSError("socket was garbage-collected")
+        return sock
+
+    def _fill(self) -> bool:
+        """Receive more data; False when the peer closed the connection"""
+        if self.end == len(self.buffer):
+            if self.start > 0:
+                # Move the partial message to the front
+                size = self.end - self.start
+                self.buffer[:size] = bytes(self.view[self.start:self.end])
+                self.scan -= self.start
+                self.start, self.end = 0, size
+            else:
+                # A message longer than the buffer: double it
+                self.view.release()
+                self.buffer.extend(bytes(len(self.buffer)))
+                self.view = memoryview(self.buffer)
+        sock = self.sock
+        n = sock.recv_into(self.view[self.end:])
+        if n == 0:
+            forget_reader(sock)  # nothing more will arrive: free the buffer now
+            return False
+        self.end += n
+        return True
+
+    def read_line(self):
+        """
+        Return the next complete line (without '\n') as bytes, or None if the
+        socket closed first. Socket timeouts propagate; buffered data is kept.
+        """
+        while True:
+            nl = self.buffer.find(b"\n", self.scan, self.end)
+            if nl >= 0:
+                line = bytes(self.view[self.start:nl])
+                self.start = self.scan = nl + 1
+                if self.start == self.end:
+                    self.start = self.end = self.scan = 0
+                return line
+            self.scan = self.end
+            if not self._fill():
+                return None
+
+    def peek_line(self):
+        """Like read_line, but the line stays buffered for the next read"""
+        while True:
+            nl = self.buffer.find(b"\n", self.scan, self.end)
+            if nl >= 0:
+                return bytes(self.view[self.start:nl])
+            self.scan = self.end
+            if not self._fill():
+                return None
+
+    def read_exact(self, n: int):
+        """Return exactly n bytes, or None if the socket closed first"""
+        while self.end - self.start < n:
+            if not self._fill():
+                return None
+        data = bytes(self.view[self.start:self.start + n])
+        self.start += n
+        self.scan = max(self.scan, self.start)
+        if self.start == self.end:
+            self.start = self.end = self.scan = 0
+        return data
+
+    def read_frame(self):
+        """Return (codec_id, payload) of the next length-prefixed frame, or None if the socket closed"""
+        header_size = FRAME_HEADER.size
+        while self.end - self.start < header_size:
+            if not self._fill():
+                return None
+        length, codec_id = FRAME_HEADER.unpack_from(self.buffer, self.start)
+        if length > MAX_FRAME_SIZE:
+            raise ValueError(f"Frame of {length} bytes exceeds MAX_FRAME_SIZE")
+        self.start += header_size
+        self.scan = max(self.scan, self.start)
+        payload = self.read_exact(length)
+        if payload is None:
+            return None
+        return codec_id, payload
+
+    def recv_json(self):
+        """
+        Return the next JSON message, or None if the socket closed.
+        Lines that fail to decode are skipped; an oversized frame, unknown
+        codec or undecodable payload is treated as a broken connection.
+        """
+        if self.codec is not None:
+            if self.broken:
+                return None
+            try:
+                frame = self.read_frame()
+                if frame is None:
+                    return None
+                codec_id, payload = frame
+                return CODECS_BY_ID[codec_id][2](payload)
+            except (KeyError, ValueError, TypeError):
+                self.broken = True
+                return None
+        while True:
+            line = self.read_line()
+            if line is None:
+                return None
+            try:
+                return json.loads(line.decode("utf-8"))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+
+    def __iter__(self):
+        """Yield every message until the socket closes"""
+        while True:
+            msg = self.recv_json()
+            if msg is None:
+                return
+            yield msg
+
+_readers = weakref.WeakKeyDictionary()  # socket -> JsonLineReader
+_readers_lock = threading.Lock()
+
+def json_reader(sock: socket.socket) -> JsonLineReader:
+    """
+    The socket's JsonLineReader (created on first use). Every recv_json on a
+    socket must go through the same reader, or buffered messages are lost.
+    """
+    with _readers_lock:
+        reader = _readers.get(sock)
+        if reader is None:
+            reader = _readers[sock] = JsonLineReader(sock)
+        return reader
+
+def forget_reader(sock: socket.socket):
+    """Drop the socket's reader (done automatically at EOF and when the socket is freed)"""
+    with _readers_lock:
+        _readers.pop(sock, None)
+
 def recv_json(sock: socket.socket):
     """
     Receive one JSON object from the socket (terminated by newline).
     Blocks until a full line received or socket closed.
-    Returns dict or None if socket closed.
+    Returns dict or None if socket closed. Messages received together with
+    it stay buffered for the next call.
+    """
+    try:
+        return json_reader(sock).recv_json()
+    except OSError:
+        return None
+
+def offer_framing(sock: socket.socket, codecs=None, timeout: float = FRAMING_TIMEOUT) -> str:
+    """
+    Connecting side: offer length-prefixed framing with the given codecs (in
+    preference order; default EXAM_SOCKET_CODECS) before the first message.
+    Returns the codec the peer picked, or "newline" if none was offered,
+    none is shared, or the peer doesn't answer within `timeout` (a peer
+    without framing support skips the offer).
+    """
+    codecs = [c for c in (OFFERED_CODECS if codecs is None else codecs) if c in CODECS]
+    if not codecs:
+        return "newline"
+    reader = json_reader(sock)
+    sock.sendall(FRAMING_PREFIX + ",".join(codecs).encode("ascii") + b"\n")
+    previous_timeout = sock.gettimeout()
+    sock.settimeout(timeout)
+    try:
+        line = reader.peek_line()
+    except socket.timeout:
+        return "newline"
+    finally:
+        sock.settimeout(previous_timeout)
+    if line is None or not line.startswith(FRAMING_PREFIX):
+        return "newline"  # an ordinary message: leave it for recv_json
+    reader.read_line()
+    chosen = line[len(FRAMING_PREFIX):].decode("ascii")
+    if chosen in CODECS:
+        reader.codec = chosen
+        return chosen
+    return "newline"
+
+def accept_framing(sock: socket.socket, codecs=None) -> str:
+    """
+    Accepting side: call before the first recv_json. If the peer opens with
+    a framing offer, pick the first offered codec we support (optionally
+    limited to `codecs`), answer, and switch the connection to frames.
+    Otherwise the peer's first message stays buffered and the connection
+    stays on newline JSON. Blocks until the peer sends its first line.
+    """
+    reader = json_reader(sock)
+    try:
+        line = reader.peek_line()
+    except OSError:
+        return "newline"
+    if line is None or not line.startswith(FRAMING_PREFIX):
+        return "newline"
+    reader.read_line()
+    offered = line[len(FRAMING_PREFIX):].decode("ascii", "replace").split(",")
+    supported = [c for c in offered if c in CODECS and (codecs is None or c in codecs)]
+    chosen = supported[0] if supported else "none"
+    sock.sendall(FRAMING_PREFIX + chosen.encode("ascii") + b"\n")
+    if supported:
+        reader.codec = chosen
+        return chosen
+    return "newline"
+
+# ---- Connection pool ----
+# For tasks that send one-way messages to fixed peers (Task 5/6): instead of
+# a new TCP connection per message, keep one open socket per peer address.
+
+class _PooledPeer:
+    def __init__(self):
+        self.sock = None
+        self.lock = threading.Lock()  # one sender at a time keeps per-peer order
+
+class ConnectionPool:
+    """
+    Persistent connections keyed by peer address. A peer is connected on
+    first use and the socket is reused by later sends. One socket per peer,
+    with sends serialized, so messages to a peer arrive in the order sent.
+    A socket the peer has closed is detected before reuse and replaced;
+    failed connects are retried with exponential backoff and full jitter.
+    Receivers must read every message on a connection, not just the first.
     """
-    buffer = b""
+    def __init__(self, connect_timeout: float = 5.0, max_attempts: int = 5,
+                 backoff_base: float = 0.1, backoff_max: float = 5.0):
+        self.connect_timeout = connect_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.peers = {}  # (host, port) -> _PooledPeer
+        self.lock = threading.Lock()
+        # metrics
+        self.hits = 0  # sends over an already open connection
+        self.connects = 0
+        self.connect_failures = 0
+        self.connect_seconds = 0.0
+        self.connect_seconds_max = 0.0
+
+    def _peer(self, addr) -> _PooledPeer:
+        with self.lock:
+            peer = self.peers.get(addr)
+            if peer is None:
+                peer = self.peers[addr] = _PooledPeer()
+            return peer
+
+    @staticmethod
+    def _is_stale(sock: socket.socket) -> bool:
+        """True if the peer closed or reset the connection (pooled peers never send to us)"""
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            if not readable:
+                return False
+            return sock.recv(1, socket.MSG_PEEK) == b""
+        except (OSError, ValueError):
+            return True
+
+    def _connect(self, addr) -> socket.socket:
+        started = time.perf_counter()
+        sock = socket.create_connection(addr, timeout=self.connect_timeout)
+        elapsed = time.perf_counter() - started
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # small messages, no Nagle delay
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        sock.settimeout(None)
+        offer_framing(sock)
+        with self.lock:
+            self.connects += 1
+            self.connect_seconds += elapsed
+            self.connect_seconds_max = max(self.connect_seconds_max, elapsed)
+        return sock
+
+    def send(self, addr, data: dict, max_attempts: int = None):
+        """
+        Send one message to `addr` over its pooled connection, connecting
+        (or reconnecting) as needed. Raises OSError once `max_attempts`
+        connects have failed.
+        """
+        addr = tuple(addr)
+        attempts = self.max_attempts if max_attempts is None else max_attempts
+        if attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        peer = self._peer(addr)
+        with peer.lock:
+            if peer.sock is not None:
+                if self._is_stale(peer.sock):
+                    self._drop(peer)
+                else:
+                    try:
+                        send_json(peer.sock, data)
+                        with self.lock:
+                            self.hits += 1
+                        return
+                    except OSError:
+                        self._drop(peer)
+            for attempt in range(attempts):
+                if attempt:
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+                    time.sleep(random.uniform(0, delay))
+                try:
+                    peer.sock = self._connect(addr)
+                    send_json(peer.sock, data)
+                    return
+                except OSError as e:
+                    error = e
+                    with self.lock:
+                        self.connect_failures += 1
+                    self._drop(peer)
+            raise error
+
+    @staticmethod
+    def _drop(peer: _PooledPeer):
+        if peer.sock is not None:
+            try:
+                peer.sock.close()
+            except OSError:
+                pass
+            peer.sock = None
+
+    def close(self):
+        """Close every pooled connection"""
+        with self.lock:
+            peers = list(self.peers.values())
+        for peer in peers:
+            with peer.lock:
+                self._drop(peer)
+
+    def stats(self) -> dict:
+        """Hit rate and connect latency so far"""
+        with self.lock:
+            sends = self.hits + self.connects
+            return {
+                "sends": sends,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / sends, 3) if sends else 0.0,
+                "connects": self.connects,
+                "connect_failures": self.connect_failures,
+                "connect_ms_avg": round(self.connect_seconds / self.connects * 1000, 3) if self.connects else 0.0,
+                "connect_ms_max": round(self.connect_seconds_max * 1000, 3),
+                "open": sum(1 for peer in self.peers.values() if peer.sock is not None),
+            }
+
+connection_pool = ConnectionPool()  # shared by all senders in a process
+
+# ---- asyncio counterparts ----
+# Same messages as send_json/recv_json, over asyncio StreamReader/StreamWriter.
+
+class _StreamState:
+    """Codec and partial-read state shared by one connection's reader and writer"""
+    def __init__(self):
+        self.codec = None  # negotiated frame codec name; None = newline JSON
+        self.frame_header = None  # (length, codec_id) of a frame whose payload is not read yet
+        self.pushback = []  # messages read during negotiation, returned first
+        self.broken = False  # framing lost: every later read reports a closed stream
+
+_stream_states = weakref.WeakKeyDictionary()  # StreamReader / StreamWriter -> _StreamState
+
+def _stream_state(reader, writer=None) -> _StreamState:
+    state = _stream_states.get(reader)
+    if state is None:
+        state = _stream_states[reader] = _StreamState()
+    if writer is not None:
+        _stream_states[writer] = state
+    return state
+
+async def _async_send_line(writer, line: bytes):
+    """Write a raw negotiation line (not JSON)"""
+    writer.write(line + b"\n")
+    await writer.drain()
+
+def _push_line(state: _StreamState, line: bytes):
+    """Keep a JSON line read during negotiation for the next async_recv_json"""
+    try:
+        state.pushback.append(json.loads(line.decode("utf-8")))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        pass  # EOF or a line async_recv_json would have skipped anyway
+
+async def async_send_json(writer, data: dict, timeout: float = None):
+    """
+    asyncio counterpart of send_json: write one '\n'-terminated JSON message
+    (or a frame, if the connection negotiated a codec) and wait for the
+    transport buffer to drain, so fast senders are slowed to the peer's pace.
+    The whole message is handed to the transport in a single write, so
+    concurrent senders never interleave and a cancelled or timed-out drain
+    (asyncio.TimeoutError) never leaves half a message on the wire.
+    """
+    state = _stream_states.get(writer)
+    if state is None or state.codec is None:
+        writer.write(_json_encode(data) + b"\n")
+    else:
+        codec_id, encode, _ = CODECS[state.codec]
+        payload = encode(data)
+        writer.write(FRAME_HEADER.pack(len(payload), codec_id) + payload)
+    if timeout is None:
+        await writer.drain()
+    else:
+        await asyncio.wait_for(writer.drain(), timeout)
+
+async def _async_recv_frame(reader, state: _StreamState):
+    if state.broken:
+        return None
+    try:
+        if state.frame_header is None:
+            state.frame_header = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+        length, codec_id = state.frame_header
+        if length > MAX_FRAME_SIZE:
+            state.broken = True  # can't resynchronise: treat as a broken connection
+            return None
+        # readexactly consumes nothing until all `length` bytes are buffered,
+        # so a cancelled read resumes at this payload next time
+        payload = await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    state.frame_header = None
+    try:
+        return CODECS_BY_ID[codec_id][2](payload)
+    except (KeyError, ValueError, TypeError):
+        state.broken = True  # unknown codec or corrupt payload: the peer is out of step
+        return None
+
+async def _async_recv(reader):
+    state = _stream_states.get(reader)
+    if state is not None:
+        if state.pushback:
+            return state.pushback.pop(0)
+        if state.codec is not None:
+            return await _async_recv_frame(reader, state)
     while True:
         try:
-            chunk = sock.recv(4096)
-        except Exception:
+            # readline only consumes a complete line, so cancelling it loses nothing
+            line = await reader.readline()
+        except (ConnectionError, ValueError):
             return None
-        if not chunk:
+        if not line:
             return None
-        buffer += chunk
-        if b"\n" in buffer:
-            line, rest = buffer.split(b"\n", 1)
-            # Put remainder back into socket-like buffer is not necessary for our usage,
-            # because we always handle messages one-by-one in a loop and don't need rest.
-            try:
-                return json.loads(line.decode("utf-8"))
-            except json.JSONDecodeError:
-                # if decode fails, skip that line
-                continue
+        try:
+            return json.loads(line.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+
+async def async_recv_json(reader, timeout: float = None):
+    """
+    asyncio counterpart of recv_json: read one '\n'-terminated JSON message
+    (or frame). Returns dict or None if the stream closed. Lines that fail
+    to decode are skipped. Raises asyncio.TimeoutError if no message arrives
+    within `timeout`; like cancellation, that consumes nothing, so the next
+    call still gets the message intact.
+    """
+    if timeout is None:
+        return await _async_recv(reader)
+    return await asyncio.wait_for(_async_recv(reader), timeout)
+
+async def async_offer_framing(reader, writer, codecs=None, timeout: float = FRAMING_TIMEOUT) -> str:
+    """
+    asyncio counterpart of offer_framing. A message that arrives instead of
+    the peer's answer is kept for the next async_recv_json.
+    """
+    codecs = [c for c in (OFFERED_CODECS if codecs is None else codecs) if c in CODECS]
+    if not codecs:
+        return "newline"
+    state = _stream_state(reader, writer)
+    await _async_send_line(writer, FRAMING_PREFIX + ",".join(codecs).encode("ascii"))
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except (asyncio.TimeoutError, ConnectionError, ValueError):
+        return "newline"
+    if not line.startswith(FRAMING_PREFIX):
+        _push_line(state, line)
+        return "newline"
+    chosen = line[len(FRAMING_PREFIX):].strip().decode("ascii")
+    if chosen in CODECS:
+        state.codec = chosen
+        return chosen
+    return "newline"
+
+async def async_accept_framing(reader, writer, codecs=None, timeout: float = None) -> str:
+    """
+    asyncio counterpart of accept_framing: call before the first
+    async_recv_json. Raises asyncio.TimeoutError if the peer sends nothing
+    within `timeout`.
+    """
+    state = _stream_state(reader, writer)
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except (ConnectionError, ValueError):
+        return "newline"
+    if not line.startswith(FRAMING_PREFIX):
+        _push_line(state, line)
+        return "newline"
+    offered = line[len(FRAMING_PREFIX):].strip().decode("ascii", "replace").split(",")
+    supported = [c for c in offered if c in CODECS and (codecs is None or c in codecs)]
+    chosen = supported[0] if supported else "none"
+    await _async_send_line(writer, FRAMING_PREFIX + chosen.encode("ascii"))
+    if supported:
+        state.codec = chosen
+        return chosen
+    return "newline"